@@ -6,11 +6,24 @@ Provides secure SQL generation with injection protection.
 
 import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Any, Optional
 
-from .config import resolve_env_tokens, resolve_secret_tokens
+import duckdb
+
+from .config import resolve_conn_tokens
 from .logger import logger
 
+# COPY ... (RETURN_STATS) reports per-column min/max of the written file (DuckDB >= 1.3)
+_COPY_RETURNS_STATS = tuple(int(p) for p in duckdb.__version__.split(".")[:2]) >= (1, 3)
+
+
+# Paths read and written through DuckDB's httpfs extension
+_HTTPFS_PREFIXES = ("s3://", "s3a://", "s3n://", "gs://", "gcs://", "r2://", "http://", "https://")
+
+# Alphanumerics, underscore and dot (schema.table)
+_IDENT_RE = re.compile(r"[a-zA-Z0-9_\.]+")
+
 
 class AdapterError(Exception):
     """Raised when adapter encounters an error."""
@@ -21,6 +34,13 @@ class AdapterError(Exception):
 class Adapter(ABC):
     """Base adapter with input validation."""
 
+    # DuckDB extensions the adapter always needs loaded
+    EXTENSIONS: frozenset[str] = frozenset()
+    # Alias the adapter ATTACHes its database under unless the config names one
+    DEFAULT_ATTACHMENT: Optional[str] = None
+    # Cheapest query that round-trips to the attached database, formatted with {name}
+    PING_SQL: Optional[str] = None
+
     def __init__(self, config: dict):
         self.config = config
         self.validate()
@@ -30,7 +50,53 @@ class Adapter(ABC):
         """Validate configuration. Raise ValueError if invalid."""
         pass
 
+    def required_extensions(self) -> frozenset[str]:
+        """
+        Get the DuckDB extensions this adapter needs.
+
+        File adapters need httpfs only when their path is remote.
+
+        Returns:
+            Extension names to load before attaching
+        """
+        path = self.config.get("path")
+        if isinstance(path, str) and path.lower().startswith(_HTTPFS_PREFIXES):
+            return self.EXTENSIONS | {"httpfs"}
+        return self.EXTENSIONS
+
+    def attachment_name(self) -> Optional[str]:
+        """
+        Get the alias of the database this adapter attaches.
+
+        Returns:
+            Sanitized attachment name, or None for adapters that attach nothing
+        """
+        if self.DEFAULT_ATTACHMENT is None:
+            return None
+        return self._sanitize_identifier(self.config.get("name", self.DEFAULT_ATTACHMENT))
+
+    def ping(self, con):
+        """
+        Check that the attached database answers a trivial query.
+
+        Unlike attach(), this also works on a connection where the database is
+        already attached, and it touches no table metadata.
+
+        Args:
+            con: DuckDB connection the adapter has attached to
+
+        Raises:
+            AdapterError: If the remote database does not respond
+        """
+        if self.PING_SQL is None:
+            return
+        try:
+            con.execute(self.PING_SQL.format(name=self.attachment_name())).fetchone()
+        except Exception as e:
+            raise AdapterError(f"Ping of '{self.attachment_name()}' failed: {e}") from e
+
     @staticmethod
+    @lru_cache(maxsize=2048)
     def _sanitize_identifier(identifier: str) -> str:
         """
         Sanitize SQL identifiers to prevent injection.
@@ -47,14 +113,30 @@ class Adapter(ABC):
         if not identifier:
             raise ValueError("Identifier cannot be empty")
 
-        # Only allow alphanumeric, underscore, and dot
-        if not re.match(r"^[a-zA-Z0-9_\.]+$", identifier):
+        # Only allow alphanumeric, underscore, and dot. Invalid names raise and are
+        # never cached; valid ones are memoized per process.
+        if not _IDENT_RE.fullmatch(identifier):
             raise ValueError(
                 f"Invalid SQL identifier: '{identifier}'. "
                 f"Only alphanumeric characters, underscore, and dot are allowed."
             )
         return identifier
 
+    @staticmethod
+    def _quote_literal(value: str) -> str:
+        """
+        Quote a value as a SQL string literal.
+
+        Used where DuckDB does not accept bound parameters, such as ATTACH paths.
+
+        Args:
+            value: Raw string value
+
+        Returns:
+            Single-quoted literal with embedded quotes doubled
+        """
+        return "'" + value.replace("'", "''") + "'"
+
 
 # ===== SOURCE ADAPTERS =====
 
@@ -96,6 +178,18 @@ class SourceAdapter(Adapter):
 
         return relation_sql
 
+    def get_row_count_sql(self, estimate: bool = False) -> Optional[str]:
+        """
+        Get SQL that returns the unfiltered row count without scanning the data.
+
+        Args:
+            estimate: Also accept a catalog estimate instead of an exact count
+
+        Returns:
+            Single-value SQL query, or None if the source has no cheap row count
+        """
+        return None
+
 
 class ParquetSourceAdapter(SourceAdapter):
     """Adapter for Parquet file sources."""
@@ -114,6 +208,10 @@ class ParquetSourceAdapter(SourceAdapter):
         # Path is safely wrapped in quotes, no injection risk
         return f"read_parquet('{path}')"
 
+    def get_row_count_sql(self, estimate: bool = False) -> Optional[str]:
+        # Row counts are stored in each file's footer, so this is always exact
+        return f"SELECT SUM(num_rows) FROM parquet_file_metadata('{self.config['path']}')"
+
 
 class CSVSourceAdapter(SourceAdapter):
     """Adapter for CSV file sources."""
@@ -135,26 +233,29 @@ class CSVSourceAdapter(SourceAdapter):
 class PostgresSourceAdapter(SourceAdapter):
     """Adapter for Postgres sources."""
 
+    EXTENSIONS = frozenset({"postgres"})
+    DEFAULT_ATTACHMENT = "pg_source_attachment"
+    PING_SQL = "SELECT * FROM postgres_query('{name}', 'SELECT 1')"
+
     def validate(self):
         if "conn" not in self.config:
             raise ValueError("Postgres source requires 'conn'")
 
     def attach(self, con):
         """Attach Postgres database to DuckDB."""
-        name = self._sanitize_identifier(self.config.get("name", "pg_source_attachment"))
-        conn_str = resolve_env_tokens(self.config["conn"])
-        conn_str = resolve_secret_tokens(conn_str)
+        name = self.attachment_name()
+        conn_str = resolve_conn_tokens(self.config["conn"])
 
         logger.info(f"Attaching Postgres database as '{name}'")
         try:
-            # Connection string is parameterized to avoid injection
-            con.execute(f"ATTACH '{conn_str}' AS {name} (TYPE postgres);")
+            # ATTACH takes no bound parameters, so the connection string is quoted
+            con.execute(f"ATTACH {self._quote_literal(conn_str)} AS {name} (TYPE postgres);")
         except Exception as e:
             logger.error(f"Failed to attach Postgres: {e}")
             raise AdapterError(f"Failed to attach Postgres database: {e}") from e
 
     def get_relation_sql(self) -> str:
-        name = self._sanitize_identifier(self.config.get("name", "pg_source_attachment"))
+        name = self.attachment_name()
 
         if "query" in self.config:
             # Custom query - wrap in subquery
@@ -170,29 +271,43 @@ class PostgresSourceAdapter(SourceAdapter):
 
         raise ValueError("Postgres source requires either 'object' or 'query'")
 
+    def get_row_count_sql(self, estimate: bool = False) -> Optional[str]:
+        if not estimate or "query" in self.config or "object" not in self.config:
+            return None
+        name = self.attachment_name()
+        obj = self._sanitize_identifier(self.config["object"])
+        # Planner estimate from the last ANALYZE; -1 (never analyzed) reads as unknown
+        return (
+            f"SELECT NULLIF(reltuples, -1)::BIGINT FROM postgres_query('{name}', "
+            f"'SELECT reltuples FROM pg_class WHERE oid = ''{obj}''::regclass')"
+        )
+
 
 class SnowflakeSourceAdapter(SourceAdapter):
     """Adapter for Snowflake sources."""
 
+    EXTENSIONS = frozenset({"snowflake"})
+    DEFAULT_ATTACHMENT = "sf_source_attachment"
+    PING_SQL = "SELECT 1 FROM {name}.information_schema.schemata LIMIT 1"
+
     def validate(self):
         if "conn" not in self.config:
             raise ValueError("Snowflake source requires 'conn'")
 
     def attach(self, con):
         """Attach Snowflake database to DuckDB."""
-        name = self._sanitize_identifier(self.config.get("name", "sf_source_attachment"))
-        conn_str = resolve_env_tokens(self.config["conn"])
-        conn_str = resolve_secret_tokens(conn_str)
+        name = self.attachment_name()
+        conn_str = resolve_conn_tokens(self.config["conn"])
 
         logger.info(f"Attaching Snowflake database as '{name}'")
         try:
-            con.execute(f"ATTACH '{conn_str}' AS {name} (TYPE snowflake);")
+            con.execute(f"ATTACH {self._quote_literal(conn_str)} AS {name} (TYPE snowflake);")
         except Exception as e:
             logger.error(f"Failed to attach Snowflake: {e}")
             raise AdapterError(f"Failed to attach Snowflake database: {e}") from e
 
     def get_relation_sql(self) -> str:
-        name = self._sanitize_identifier(self.config.get("name", "sf_source_attachment"))
+        name = self.attachment_name()
 
         if "query" in self.config:
             return f"({self.config['query']})"
@@ -213,6 +328,11 @@ class SnowflakeSourceAdapter(SourceAdapter):
 class TargetAdapter(Adapter):
     """Base class for target adapters."""
 
+    def __init__(self, config: dict):
+        super().__init__(config)
+        # Write SQL is fixed by the config, so it is assembled once around the relation
+        self._write_sql_parts = self._build_write_sql_parts()
+
     @abstractmethod
     def attach(self, con):
         """Attach target to DuckDB connection if needed."""
@@ -223,6 +343,28 @@ class TargetAdapter(Adapter):
         """Build SQL to write data to target."""
         pass
 
+    def _build_write_sql_parts(self) -> Optional[tuple[str, str]]:
+        """
+        Assemble the write SQL that goes before and after the source relation.
+
+        Returns:
+            (head, tail) pair, or None if the config does not name a table yet
+        """
+        return None
+
+    def build_write_sql_with_stats(self, relation_sql: str) -> Optional[str]:
+        """
+        Build write SQL whose result also reports per-column statistics.
+
+        Args:
+            relation_sql: Relation to write
+
+        Returns:
+            SQL returning "count" and "column_statistics" columns, or None if the
+            target cannot report statistics
+        """
+        return None
+
     def sync_schema(self, con, relation_sql: str, evolution_override: Optional[str] = None):
         """
         Synchronize target schema with source schema.
@@ -322,12 +464,26 @@ class ParquetTargetAdapter(TargetAdapter):
         pass
 
     def build_write_sql(self, relation_sql: str) -> str:
+        return self._build_copy_sql(relation_sql)
+
+    def build_write_sql_with_stats(self, relation_sql: str) -> Optional[str]:
+        if not _COPY_RETURNS_STATS:
+            return None
+        return self._build_copy_sql(relation_sql, ", RETURN_STATS true")
+
+    def _build_write_sql_parts(self) -> tuple[str, str]:
         path = self.config["path"]
         compression = self.config.get("compression", "zstd")
+        # Use COPY TO for optimal performance; options are closed by _build_copy_sql
+        return (
+            "COPY (SELECT * FROM ",
+            f") TO '{path}' (FORMAT parquet, COMPRESSION {compression}",
+        )
 
-        logger.debug(f"Writing Parquet to: {path}")
-        # Use COPY TO for optimal performance
-        return f"COPY (SELECT * FROM {relation_sql}) TO '{path}' (FORMAT parquet, COMPRESSION {compression});"
+    def _build_copy_sql(self, relation_sql: str, extra_options: str = "") -> str:
+        head, tail = self._write_sql_parts
+        logger.debug(f"Writing Parquet to: {self.config['path']}")
+        return f"{head}{relation_sql}{tail}{extra_options});"
 
 
 class CSVTargetAdapter(TargetAdapter):
@@ -342,13 +498,28 @@ class CSVTargetAdapter(TargetAdapter):
         pass
 
     def build_write_sql(self, relation_sql: str) -> str:
+        head, tail = self._write_sql_parts
+        logger.debug(f"Writing CSV to: {self.config['path']}")
+        return f"{head}{relation_sql}{tail}"
+
+    def _build_write_sql_parts(self) -> tuple[str, str]:
         path = self.config["path"]
-        logger.debug(f"Writing CSV to: {path}")
-        return f"COPY (SELECT * FROM {relation_sql}) TO '{path}' (HEADER, DELIMITER ',');"
+        return "COPY (SELECT * FROM ", f") TO '{path}' (HEADER, DELIMITER ',');"
 
 
 class PostgresTargetAdapter(TargetAdapter):
-    """Adapter for Postgres targets."""
+    """
+    Adapter for Postgres targets.
+
+    Writes are plain ``INSERT ... SELECT`` / ``CREATE TABLE AS`` statements against
+    the attached database. DuckDB's postgres extension executes these by streaming
+    rows to the server with ``COPY ... FROM STDIN (FORMAT binary)``, so there is no
+    per-row round trip and no need for a separate psycopg/ADBC bulk-load path.
+    """
+
+    EXTENSIONS = frozenset({"postgres"})
+    DEFAULT_ATTACHMENT = "pg_target_attachment"
+    PING_SQL = "SELECT * FROM postgres_query('{name}', 'SELECT 1')"
 
     def validate(self):
         if "conn" not in self.config:
@@ -358,13 +529,12 @@ class PostgresTargetAdapter(TargetAdapter):
 
     def attach(self, con):
         """Attach Postgres database to DuckDB with categorized error handling."""
-        name = self._sanitize_identifier(self.config.get("name", "pg_target_attachment"))
-        conn_str = resolve_env_tokens(self.config["conn"])
-        conn_str = resolve_secret_tokens(conn_str)
+        name = self.attachment_name()
+        conn_str = resolve_conn_tokens(self.config["conn"])
 
         logger.info(f"Attaching Postgres database as '{name}'")
         try:
-            con.execute(f"ATTACH '{conn_str}' AS {name} (TYPE postgres);")
+            con.execute(f"ATTACH {self._quote_literal(conn_str)} AS {name} (TYPE postgres);")
         except Exception as e:
             error_msg = str(e).lower()
             logger.error(f"Failed to attach Postgres: {e}")
@@ -390,45 +560,51 @@ class PostgresTargetAdapter(TargetAdapter):
                 raise AdapterError(f"Failed to attach Postgres database '{name}': {e}") from e
 
     def build_write_sql(self, relation_sql: str) -> str:
-        name = self._sanitize_identifier(self.config.get("name", "pg_target_attachment"))
+        if self._write_sql_parts is None:
+            raise ValueError("Postgres target requires 'table' for write operations")
+
+        head, tail = self._write_sql_parts
+        logger.info(self._write_message)
+        return f"{head}{relation_sql}{tail}"
+
+    def _build_write_sql_parts(self) -> Optional[tuple[str, str]]:
         table_name = self.config.get("table")
         if not table_name:
-            raise ValueError("Postgres target requires 'table' for write operations")
+            return None
 
-        table = self._sanitize_identifier(table_name)
+        # Prefix table with attachment name
+        full_table = f"{self.attachment_name()}.{self._sanitize_identifier(table_name)}"
         mode = self.config.get("mode", "append")
         unique_key = self.config.get("unique_key")
 
-        # Prefix table with attachment name if not already qualified
-        if "." in table:
-            full_table = f"{name}.{table}"
-        else:
-            full_table = f"{name}.{table}"
-
         if mode == "overwrite":
-            logger.info(f"Overwriting table: {full_table}")
-            return f"""
-            DROP TABLE IF EXISTS {full_table};
-            CREATE TABLE {full_table} AS SELECT * FROM {relation_sql};
-            """
+            self._write_message = f"Overwriting table: {full_table}"
+            return (
+                f"DROP TABLE IF EXISTS {full_table}; CREATE TABLE {full_table} AS SELECT * FROM ",
+                ";",
+            )
         elif mode == "upsert":
             if not unique_key:
                 raise ValueError("Upsert requires 'unique_key' configuration")
 
-            logger.info(f"Upserting to table: {full_table} using key: {unique_key}")
+            self._write_message = f"Upserting to table: {full_table} using key: {unique_key}"
             # DuckDB via Postgres attachment handles INSERT OR REPLACE as standard insert or specialized logic?
             # Safe bet with DuckDB's postgres scanner is standard SQL passed.
             # But standard PG needs `ON CONFLICT`.
             # We'll use DuckDB's `INSERT OR REPLACE INTO` which is the dedicated upsert syntax
-            return f"INSERT OR REPLACE INTO {full_table} SELECT * FROM {relation_sql};"
+            return f"INSERT OR REPLACE INTO {full_table} SELECT * FROM ", ";"
         else:
-            logger.info(f"Appending to table: {full_table}")
-            return f"INSERT INTO {full_table} SELECT * FROM {relation_sql};"
+            self._write_message = f"Appending to table: {full_table}"
+            return f"INSERT INTO {full_table} SELECT * FROM ", ";"
 
 
 class SnowflakeTargetAdapter(TargetAdapter):
     """Adapter for Snowflake targets."""
 
+    EXTENSIONS = frozenset({"snowflake"})
+    DEFAULT_ATTACHMENT = "sf_target_attachment"
+    PING_SQL = "SELECT 1 FROM {name}.information_schema.schemata LIMIT 1"
+
     def validate(self):
         if "conn" not in self.config:
             raise ValueError("Snowflake target requires 'conn'")
@@ -436,13 +612,12 @@ class SnowflakeTargetAdapter(TargetAdapter):
 
     def attach(self, con):
         """Attach Snowflake database to DuckDB with categorized error handling."""
-        name = self._sanitize_identifier(self.config.get("name", "sf_target_attachment"))
-        conn_str = resolve_env_tokens(self.config["conn"])
-        conn_str = resolve_secret_tokens(conn_str)
+        name = self.attachment_name()
+        conn_str = resolve_conn_tokens(self.config["conn"])
 
         logger.info(f"Attaching Snowflake database as '{name}'")
         try:
-            con.execute(f"ATTACH '{conn_str}' AS {name} (TYPE snowflake);")
+            con.execute(f"ATTACH {self._quote_literal(conn_str)} AS {name} (TYPE snowflake);")
         except Exception as e:
             error_msg = str(e).lower()
             logger.error(f"Failed to attach Snowflake: {e}")
@@ -473,33 +648,48 @@ class SnowflakeTargetAdapter(TargetAdapter):
                 raise AdapterError(f"Failed to attach Snowflake database '{name}': {e}") from e
 
     def build_write_sql(self, relation_sql: str) -> str:
-        name = self._sanitize_identifier(self.config.get("name", "sf_target_attachment"))
-        table_name = self.config.get("table")
-        if not table_name:
+        if self._write_sql_parts is None:
             raise ValueError("Snowflake target requires 'table' for write operations")
 
-        table = self._sanitize_identifier(table_name)
-        mode = self.config.get("mode", "append")
+        head, tail = self._write_sql_parts
+        logger.info(self._write_message)
+        return f"{head}{relation_sql}{tail}"
+
+    def _build_write_sql_parts(self) -> Optional[tuple[str, str]]:
+        table_name = self.config.get("table")
+        if not table_name:
+            return None
 
         # Construct fully qualified table name
-        if "." in table:
-            full_table = f"{name}.{table}"
-        else:
-            full_table = f"{name}.{table}"
+        full_table = f"{self.attachment_name()}.{self._sanitize_identifier(table_name)}"
 
-        if mode == "overwrite":
-            logger.info(f"Overwriting Snowflake table: {full_table}")
-            return f"""
-            DROP TABLE IF EXISTS {full_table};
-            CREATE TABLE {full_table} AS SELECT * FROM {relation_sql};
-            """
+        if self.config.get("mode", "append") == "overwrite":
+            self._write_message = f"Overwriting Snowflake table: {full_table}"
+            return (
+                f"DROP TABLE IF EXISTS {full_table}; CREATE TABLE {full_table} AS SELECT * FROM ",
+                ";",
+            )
         else:
-            logger.info(f"Appending to Snowflake table: {full_table}")
-            return f"INSERT INTO {full_table} SELECT * FROM {relation_sql};"
+            self._write_message = f"Appending to Snowflake table: {full_table}"
+            return f"INSERT INTO {full_table} SELECT * FROM ", ";"
 
 
 # ===== FACTORY FUNCTIONS =====
 
+_SOURCE_ADAPTERS: dict[str, type[SourceAdapter]] = {
+    "parquet": ParquetSourceAdapter,
+    "csv": CSVSourceAdapter,
+    "postgres": PostgresSourceAdapter,
+    "snowflake": SnowflakeSourceAdapter,
+}
+
+_TARGET_ADAPTERS: dict[str, type[TargetAdapter]] = {
+    "parquet": ParquetTargetAdapter,
+    "csv": CSVTargetAdapter,
+    "postgres": PostgresTargetAdapter,
+    "snowflake": SnowflakeTargetAdapter,
+}
+
 
 def create_source_adapter(config: dict) -> SourceAdapter:
     """
@@ -515,18 +705,11 @@ def create_source_adapter(config: dict) -> SourceAdapter:
         ValueError: If source type is unsupported
     """
     source_type = config.get("type")
-
-    adapters = {
-        "parquet": ParquetSourceAdapter,
-        "csv": CSVSourceAdapter,
-        "postgres": PostgresSourceAdapter,
-        "snowflake": SnowflakeSourceAdapter,
-    }
-
-    if source_type not in adapters:
+    adapter_cls = _SOURCE_ADAPTERS.get(source_type)
+    if adapter_cls is None:
         raise ValueError(f"Unsupported source type: {source_type}")
 
-    return adapters[source_type](config)
+    return adapter_cls(config)
 
 
 def create_target_adapter(config: dict) -> TargetAdapter:
@@ -543,18 +726,11 @@ def create_target_adapter(config: dict) -> TargetAdapter:
         ValueError: If target type is unsupported
     """
     target_type = config.get("type")
-
-    adapters = {
-        "parquet": ParquetTargetAdapter,
-        "csv": CSVTargetAdapter,
-        "postgres": PostgresTargetAdapter,
-        "snowflake": SnowflakeTargetAdapter,
-    }
-
-    if target_type not in adapters:
+    adapter_cls = _TARGET_ADAPTERS.get(target_type)
+    if adapter_cls is None:
         raise ValueError(f"Unsupported target type: {target_type}")
 
-    return adapters[target_type](config)
+    return adapter_cls(config)
 
 
 # ===== LEGACY COMPATIBILITY FUNCTIONS =====
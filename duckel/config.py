@@ -2,19 +2,80 @@
 Configuration loading and validation using Pydantic.
 """
 
+import json
 import os
 import re
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Optional
 
 import yaml
 from dotenv import load_dotenv
+from pydantic import TypeAdapter, ValidationError
 
 from .logger import logger
 from .models import PipelineConfig
 
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _BaseLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _Dumper
+    from yaml import SafeLoader as _BaseLoader
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, see the "fast" extra
+    orjson = None
+
 # Load environment variables from .env file if it exists
 load_dotenv()
 
+_PLAINTEXT_PASSWORD_RE = re.compile(r"(?i)\b(?:password|pwd)\s*=\s*(?!__ENV:|SECRET:)")
+_ENV_TOKEN_RE = re.compile(r"__ENV:([A-Z0-9_]+)")
+_SECRET_TOKEN_RE = re.compile(r"SECRET:([A-Z0-9_]+)")
+# Short identifier-like scalars ("append", "postgres", column names) that are worth interning
+_IDENT_ALLOWED = re.compile(r"[A-Za-z0-9_.]{1,32}")
+_STR_TAG = "tag:yaml.org,2002:str"
+# Validates the whole pipelines mapping in one call
+_PIPELINES_ADAPTER = TypeAdapter(dict[str, PipelineConfig])
+# (path, mtime_ns, size, selection, environment hash) -> validated pipelines, most recent last
+_CONFIG_CACHE: OrderedDict[tuple, dict[str, PipelineConfig]] = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+_config_cache_lock = threading.Lock()
+# conn -> (referenced variable names, their values when resolved, resolved conn)
+_resolved_conns: dict[str, tuple[tuple[str, ...], tuple[Optional[str], ...], str]] = {}
+
+
+@lru_cache(maxsize=512)
+def _token_names(pattern: re.Pattern, s: str) -> tuple[str, ...]:
+    """Distinct variable names referenced by pattern's tokens in s, in order."""
+    return tuple(dict.fromkeys(pattern.findall(s)))
+
+
+@lru_cache(maxsize=512)
+def _split_tokens(pattern: re.Pattern, s: str) -> tuple[str, ...]:
+    """Split s into literal text and pattern's token names, alternating (names at odd indices)."""
+    return tuple(pattern.split(s))
+
+
+def _substitute_tokens(pattern: re.Pattern, s: str, values: tuple[str, ...]) -> str:
+    """
+    Replace pattern's tokens in s with values (aligned with _token_names).
+
+    Only the split of the template is cached. The substituted string holds the
+    resolved values (often credentials), so it is built on every call and never
+    kept at module level.
+    """
+    lookup = dict(zip(_token_names(pattern, s), values))
+    parts = list(_split_tokens(pattern, s))
+    parts[1::2] = [lookup[name] for name in parts[1::2]]
+    return "".join(parts)
+
 
 def resolve_env_tokens(s: str) -> str:
     """
@@ -25,24 +86,23 @@ def resolve_env_tokens(s: str) -> str:
 
     Returns:
         String with environment variables resolved
+
+    Raises:
+        ValueError: If any referenced variable is unset; all missing names are reported
     """
-    if not isinstance(s, str):
+    if not isinstance(s, str) or "__ENV:" not in s:
         return s
 
-    pattern = r"__ENV:([A-Z0-9_]+)"
-    matches = re.finditer(pattern, s)
-
-    result = s
-    for match in matches:
-        token = match.group(0)
-        var = match.group(1)
-        value = os.environ.get(var, "")
-        if not value:
-            logger.error(f"Environment variable {var} not found")
-            raise ValueError(f"Required environment variable '{var}' is not set.")
-        result = result.replace(token, value)
+    names = _token_names(_ENV_TOKEN_RE, s)
+    getenv = os.environ.get
+    values = tuple(getenv(name, "") for name in names)
+    missing = [name for name, value in zip(names, values) if not value]
+    if missing:
+        missing_names = ", ".join(sorted(missing))
+        logger.error("Environment variables not set: %s", missing_names)
+        raise ValueError(f"Required environment variable(s) not set: {missing_names}")
 
-    return result
+    return _substitute_tokens(_ENV_TOKEN_RE, s, values)
 
 
 def resolve_secret_tokens(s: str) -> str:
@@ -57,29 +117,87 @@ def resolve_secret_tokens(s: str) -> str:
 
     Returns:
         String with secrets resolved
+
+    Raises:
+        ValueError: If any referenced secret is unset; all missing names are reported
     """
-    if not isinstance(s, str):
+    if not isinstance(s, str) or "SECRET:" not in s:
         return s
 
-    pattern = r"SECRET:([A-Z0-9_]+)"
-    matches = re.finditer(pattern, s)
+    # TODO: Integrate with AWS Secrets Manager / Azure Key Vault
+    names = _token_names(_SECRET_TOKEN_RE, s)
+    getenv = os.environ.get
+    values = tuple(getenv(name, "") for name in names)
+    missing = [name for name, value in zip(names, values) if not value]
+    if missing:
+        missing_names = ", ".join(sorted(missing))
+        logger.error("Secrets not found in environment: %s", missing_names)
+        raise ValueError(f"Required secret(s) not set: {missing_names}")
 
-    result = s
-    for match in matches:
-        token = match.group(0)
-        secret_name = match.group(1)
-        # TODO: Integrate with AWS Secrets Manager / Azure Key Vault
-        value = os.environ.get(secret_name, "")
-        if not value:
-            logger.error(f"Secret {secret_name} not found in environment")
-            raise ValueError(f"Required secret '{secret_name}' is not set.")
+    return _substitute_tokens(_SECRET_TOKEN_RE, s, values)
 
-        # If the entire string is just the token, return the value directly (to preserve type if possible, though here it's still string)
-        if s == token:
-            return value
-        result = result.replace(token, value)
 
-    return result
+def resolve_conn_tokens(conn: str) -> str:
+    """
+    Resolve __ENV:/SECRET: tokens in a connection string, memoized per process.
+
+    Scheduled pipelines attach with the same connection string on every run. The
+    resolved value is reused for as long as the variables it references keep the
+    values they had when it was resolved.
+
+    Args:
+        conn: Connection string potentially containing tokens
+
+    Returns:
+        Connection string with tokens resolved
+
+    Raises:
+        ValueError: If any referenced variable or secret is unset
+    """
+    cached = _resolved_conns.get(conn)
+    if cached is not None:
+        names, stamp, resolved = cached
+        if tuple(os.environ.get(name) for name in names) == stamp:
+            return resolved
+
+    env_resolved = resolve_env_tokens(conn)
+    resolved = resolve_secret_tokens(env_resolved)
+    names = tuple(
+        dict.fromkeys(_ENV_TOKEN_RE.findall(conn) + _SECRET_TOKEN_RE.findall(env_resolved))
+    )
+    _resolved_conns[conn] = (names, tuple(os.environ.get(name) for name in names), resolved)
+    return resolved
+
+
+def _map_strings(obj: Any, func: Callable[[str], str]) -> Any:
+    """
+    Copy a nested dict/list structure, applying func to every string in it.
+
+    Walks the tree with an explicit stack rather than recursion, so deeply nested
+    configs cost no Python frames per level and cannot hit the recursion limit.
+    """
+    if isinstance(obj, str):
+        return func(obj)
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    root = {} if isinstance(obj, dict) else []
+    stack = [(obj, root)]
+    while stack:
+        src, dst = stack.pop()
+        is_dict = isinstance(src, dict)
+        for key, value in src.items() if is_dict else enumerate(src):
+            if isinstance(value, str):
+                value = func(value)
+            elif isinstance(value, (dict, list)):
+                child = {} if isinstance(value, dict) else []
+                stack.append((value, child))
+                value = child
+            if is_dict:
+                dst[key] = value
+            else:
+                dst.append(value)
+    return root
 
 
 def resolve_tokens_in_dict(d: dict) -> dict:
@@ -87,28 +205,272 @@ def resolve_tokens_in_dict(d: dict) -> dict:
     Recursively resolve environment and secret tokens in a dictionary.
 
     Args:
-        d: Dictionary potentially containing token strings
+        d: Dictionary potentially containing token strings (nested dicts and lists
+            are resolved too)
 
     Returns:
         Dictionary with all tokens resolved
     """
-    result = {}
-    for key, value in d.items():
-        if isinstance(value, str):
-            value = resolve_env_tokens(value)
-            value = resolve_secret_tokens(value)
-        elif isinstance(value, dict):
-            value = resolve_tokens_in_dict(value)
-        result[key] = value
-    return result
+    return _map_strings(d, lambda value: resolve_secret_tokens(resolve_env_tokens(value)))
+
+
+def _reject_plaintext_password(value: str) -> str:
+    """Raise ValueError if a config scalar holds a plain-text password, else return it."""
+    if _PLAINTEXT_PASSWORD_RE.search(value):
+        raise ValueError(
+            "Plain-text passwords are not allowed in configurations. Use __ENV:VAR or SECRET:VAR instead."
+        )
+    return value
+
+
+def _resolve_scalar(value: str) -> str:
+    """
+    Reject plain-text passwords and resolve __ENV:/SECRET: tokens in a config scalar.
+
+    Args:
+        value: Raw string scalar from a configuration file
+
+    Returns:
+        String with tokens resolved
+
+    Raises:
+        ValueError: If the value contains a plain-text password or an unset variable
+    """
+    _reject_plaintext_password(value)
+    if _IDENT_ALLOWED.fullmatch(value):
+        # Token-free by construction, so no resolved secret ends up in the intern table
+        return sys.intern(value)
+    return resolve_secret_tokens(resolve_env_tokens(value))
+
+
+def _resolve_scalars(obj: Any) -> Any:
+    """Apply _resolve_scalar to every string value in a nested dict/list structure."""
+    return _map_strings(obj, _resolve_scalar)
+
+
+def _json_sidecar_path(config_path: Path) -> Path:
+    """Return the path of the auto-generated JSON cache for a YAML config file."""
+    return config_path.with_suffix(".json")
+
+
+def _check_json_keys(obj: Any) -> None:
+    """Raise TypeError for non-string mapping keys, which json.dumps would stringify."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Dict key must be str, not {type(key).__name__}: {key!r}")
+            _check_json_keys(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            _check_json_keys(item)
+
+
+def _dumps_json(data: Any) -> bytes:
+    """
+    Serialize data to JSON bytes, using orjson when available.
+
+    Values that would not load back unchanged (dates, non-string keys) raise
+    TypeError instead of being converted to strings.
+    """
+    if orjson is not None:
+        # Without the passthrough option orjson writes dates as ISO strings
+        return orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    _check_json_keys(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_sidecar(config_path: Path, st: os.stat_result) -> Optional[dict[str, Any]]:
+    """
+    Load the JSON sidecar of a config file if it was written for the YAML as it is now.
+
+    The sidecar records the YAML's mtime and size when it was written. Any other
+    stat (an edit in the same timestamp tick, a restore with an older mtime)
+    means the YAML changed since, so the sidecar is ignored.
+
+    Args:
+        config_path: Path to the YAML configuration file
+        st: Current stat of the YAML file
+
+    Returns:
+        Raw (unresolved) configuration dict, or None if no usable sidecar exists
+    """
+    sidecar = _json_sidecar_path(config_path)
+    try:
+        cached = _loads_json(sidecar.read_bytes())
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring unreadable config cache {sidecar}: {e}")
+        return None
+    if not isinstance(cached, dict) or cached.get("yaml") != [st.st_mtime_ns, st.st_size]:
+        return None
+    cfg = cached.get("config")
+    return cfg if isinstance(cfg, dict) else None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Replace a file's contents so readers see either the old or the new file.
 
+    The data is written and fsynced to a sibling temp file which is then moved
+    over the target with os.replace (atomic on POSIX and Windows).
 
-def load_config(path: str) -> dict[str, PipelineConfig]:
+    Args:
+        path: File to write
+        data: New file contents
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_sidecar(config_path: Path, cfg: dict[str, Any]) -> None:
+    """
+    Write the JSON sidecar for a config file, or remove it if cfg is not JSON-compatible.
+
+    The YAML must already be written: its mtime and size are stored with cfg.
+
+    Args:
+        config_path: Path to the YAML configuration file
+        cfg: Raw configuration dict that was written to the YAML file
+    """
+    sidecar = _json_sidecar_path(config_path)
+    st = config_path.stat()
+    try:
+        payload = _dumps_json({"yaml": [st.st_mtime_ns, st.st_size], "config": cfg})
+    except TypeError as e:
+        # e.g. YAML timestamps or integer keys; YAML stays the only source of truth
+        logger.debug(f"Config not JSON-compatible, skipping cache: {e}")
+        sidecar.unlink(missing_ok=True)
+        return
+    _atomic_write(sidecar, payload)
+
+
+class _ConfigLoader(_BaseLoader):
+    """
+    Safe YAML loader that checks and resolves tokens while scalars are constructed.
+
+    Fusing the plain-text password check and token resolution into construction
+    avoids a second walk over the loaded document.
+    """
+
+    def construct_resolved_str(self, node: yaml.ScalarNode) -> str:
+        return _resolve_scalar(self.construct_scalar(node))
+
+    def construct_key(self, node: yaml.Node, deep: bool = False) -> Any:
+        """Construct a mapping key; string keys are structure and stay unresolved."""
+        if isinstance(node, yaml.ScalarNode) and node.tag == _STR_TAG:
+            return self.construct_scalar(node)
+        return self.construct_object(node, deep=deep)
+
+    def construct_mapping(self, node: yaml.MappingNode, deep: bool = False) -> dict:
+        # Same as the base implementation, except that keys skip construct_resolved_str
+        # (as on the JSON sidecar path, where only values are resolved)
+        self.flatten_mapping(node)
+        mapping = {}
+        for key_node, value_node in node.value:
+            key = self.construct_key(key_node, deep=deep)
+            try:
+                hash(key)
+            except TypeError as e:
+                raise yaml.constructor.ConstructorError(
+                    "while constructing a mapping",
+                    node.start_mark,
+                    f"found unhashable key ({e})",
+                    key_node.start_mark,
+                ) from None
+            mapping[key] = self.construct_object(value_node, deep=deep)
+        return mapping
+
+
+def _check_node_passwords(node: yaml.Node) -> None:
+    """
+    Reject plain-text passwords in a node's string values without constructing it.
+
+    Pipelines skipped by load_config's `only` are still checked this way; tokens
+    in them are left unresolved.
+    """
+    stack, seen = [node], set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:  # aliases can make the node graph cyclic
+            continue
+        seen.add(id(node))
+        if isinstance(node, yaml.ScalarNode):
+            if node.tag == _STR_TAG:
+                _reject_plaintext_password(node.value)
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(node.value)
+        elif isinstance(node, yaml.MappingNode):
+            stack.extend(value_node for _, value_node in node.value)
+
+
+_ConfigLoader.add_constructor(_STR_TAG, _ConfigLoader.construct_resolved_str)
+
+
+def _load_pipeline_dicts(f, only: Optional[Iterable[str]] = None) -> dict[str, Any]:
+    """
+    Compose the YAML node graph and construct only the requested pipelines.
+
+    Args:
+        f: Open configuration file
+        only: Optional pipeline names to construct; all pipelines when None. The
+            others are only checked for plain-text passwords
+
+    Returns:
+        Dictionary mapping pipeline names to raw (token-resolved) pipeline dicts
+    """
+    wanted = set(only) if only is not None else None
+    loader = _ConfigLoader(f)
+    try:
+        root = loader.get_single_node()
+        pipelines_node = None
+        if isinstance(root, yaml.MappingNode):
+            for key_node, value_node in root.value:
+                if isinstance(key_node, yaml.ScalarNode) and key_node.value == "pipelines":
+                    pipelines_node = value_node
+                    break
+
+        if pipelines_node is None:
+            raise ValueError("Missing top-level 'pipelines' key in configuration")
+        if not isinstance(pipelines_node, yaml.MappingNode):
+            raise ValueError("Top-level 'pipelines' key must be a mapping of pipeline definitions")
+
+        pipelines = {}
+        for key_node, value_node in pipelines_node.value:
+            # Keys like `2024:` load as ints; names are strings everywhere else
+            name = str(loader.construct_key(key_node))
+            if wanted is not None and name not in wanted:
+                _check_node_passwords(value_node)
+                continue
+            pipelines[name] = loader.construct_object(value_node, deep=True)
+        return pipelines
+    finally:
+        loader.dispose()
+
+
+def load_config(path: str, only: Optional[Iterable[str]] = None) -> dict[str, PipelineConfig]:
     """
     Load and validate pipeline configuration from YAML file.
 
     Args:
         path: Path to YAML configuration file
+        only: Optional pipeline names to load. Other pipelines are only checked
+            for plain-text passwords; they are neither token-resolved nor
+            validated. Unknown names are ignored.
 
     Returns:
         Dictionary mapping pipeline names to validated PipelineConfig objects
@@ -118,40 +480,62 @@ def load_config(path: str) -> dict[str, PipelineConfig]:
         FileNotFoundError: If config file doesn't exist
     """
     config_path = Path(path)
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {path}")
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {path}") from None
+
+    # Tokens are resolved while loading, so the environment is part of the key
+    cache_key = (
+        str(config_path.resolve()),
+        st.st_mtime_ns,
+        st.st_size,
+        frozenset(only) if only is not None else None,
+        hash(frozenset(os.environ.items())),
+    )
+    use_cache = not os.getenv("DUCKEL_DISABLE_CONFIG_CACHE")
+    if use_cache:
+        with _config_cache_lock:
+            cached_pipelines = _CONFIG_CACHE.get(cache_key)
+            if cached_pipelines is not None:
+                _CONFIG_CACHE.move_to_end(cache_key)
+        if cached_pipelines is not None:
+            logger.debug(f"Using cached configuration for {path}")
+            # Callers may modify what they get back, so each one gets its own copy
+            return {name: config.model_copy(deep=True) for name, config in cached_pipelines.items()}
 
     logger.info(f"Loading configuration from {path}")
 
-    with open(path, encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
-
-    if "pipelines" not in cfg:
-        raise ValueError("Missing top-level 'pipelines' key in configuration")
-
-    import json
-    import re
-
-    raw_str = json.dumps(cfg)
-    if re.search(r"(?i)\b(?:password|pwd)\s*=\s*(?!__ENV:|SECRET:)", raw_str):
-        raise ValueError(
-            "Plain-text passwords are not allowed in configurations. Use __ENV:VAR or SECRET:VAR instead."
-        )
-
-    # Resolve environment variables and secrets
-    cfg = resolve_tokens_in_dict(cfg)
+    cached = _load_sidecar(config_path, st)
+    if cached is not None and isinstance(cached.get("pipelines"), dict):
+        wanted = set(only) if only is not None else None
+        pipelines = {}
+        for name, pipeline_dict in cached["pipelines"].items():
+            if wanted is None or name in wanted:
+                pipelines[name] = _resolve_scalars(pipeline_dict)
+            else:
+                _map_strings(pipeline_dict, _reject_plaintext_password)
+    else:
+        # Tokens are resolved (and plain-text passwords rejected) during construction
+        with open(path, encoding="utf-8") as f:
+            pipelines = _load_pipeline_dicts(f, only)
 
-    # Validate each pipeline configuration
-    validated_pipelines = {}
-    for name, pipeline_dict in cfg["pipelines"].items():
-        try:
-            validated_pipelines[name] = PipelineConfig(**pipeline_dict)
-            logger.debug(f"Validated pipeline: {name}")
-        except Exception as e:
-            logger.error(f"Invalid configuration for pipeline '{name}': {e}")
-            raise ValueError(f"Invalid configuration for pipeline '{name}': {e}") from e
+    # Validate all pipeline configurations; error locations start with the pipeline name
+    try:
+        validated_pipelines = _PIPELINES_ADAPTER.validate_python(pipelines)
+    except ValidationError as e:
+        name = e.errors()[0]["loc"][0]
+        logger.error(f"Invalid configuration for pipeline '{name}': {e}")
+        raise ValueError(f"Invalid configuration for pipeline '{name}': {e}") from e
 
     logger.info(f"Loaded {len(validated_pipelines)} pipelines")
+    if use_cache:
+        with _config_cache_lock:
+            _CONFIG_CACHE[cache_key] = {
+                name: config.model_copy(deep=True) for name, config in validated_pipelines.items()
+            }
+            while len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+                _CONFIG_CACHE.popitem(last=False)
     return validated_pipelines
 
 
@@ -159,6 +543,9 @@ def save_pipeline_config(path: str, name: str, config: PipelineConfig) -> None:
     """
     Save a pipeline configuration to the YAML file.
 
+    A JSON copy of the file is written alongside it (e.g. pipelines.json) and is
+    preferred by load_config until the YAML's mtime or size changes.
+
     Args:
         path: Path to YAML configuration file
         name: Name of the pipeline
@@ -169,7 +556,7 @@ def save_pipeline_config(path: str, name: str, config: PipelineConfig) -> None:
     # Read existing config
     if config_path.exists():
         with open(path, encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+            cfg = yaml.load(f, Loader=_BaseLoader) or {}
     else:
         cfg = {"pipelines": {}}
 
@@ -181,8 +568,10 @@ def save_pipeline_config(path: str, name: str, config: PipelineConfig) -> None:
     pipeline_dict = config.model_dump(exclude_defaults=True)
     cfg["pipelines"][name] = pipeline_dict
 
-    # Write back
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(cfg, f, sort_keys=False, indent=2)
+    # Write back; an interrupted save leaves the previous file intact
+    _atomic_write(
+        config_path, yaml.dump(cfg, Dumper=_Dumper, sort_keys=False, indent=2).encode("utf-8")
+    )
+    _write_sidecar(config_path, cfg)
 
     logger.info(f"Saved pipeline '{name}' to {path}")
@@ -3,13 +3,22 @@ DuckDB engine management with proper lifecycle and error handling.
 """
 
 import os
+from collections.abc import Iterable
 from contextlib import contextmanager
 from typing import Optional
 
 import duckdb
 
+from .config import resolve_env_tokens  # noqa: F401  (re-exported for older imports)
 from .logger import logger
 
+# Extensions that are published in the community repository rather than core
+COMMUNITY_EXTENSIONS = frozenset({"snowflake"})
+
+# Loaded by default; a failure to load a required extension is fatal
+REQUIRED_EXTENSIONS = ("postgres", "httpfs")
+OPTIONAL_EXTENSIONS = ("snowflake",)
+
 
 class DuckDBEngineError(Exception):
     """Raised when DuckDB engine encounters an error."""
@@ -26,7 +35,13 @@ class DuckDBEngine:
             result = con.execute("SELECT * FROM table").fetchdf()
     """
 
-    def __init__(self, db_path: str = ":memory:", threads: int = 4, memory_limit: str = "2GB"):
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        threads: int = 4,
+        memory_limit: str = "2GB",
+        extensions: Optional[Iterable[str]] = None,
+    ):
         """
         Initialize DuckDB engine configuration.
 
@@ -34,10 +49,17 @@ class DuckDBEngine:
             db_path: Path to DuckDB database file (":memory:" for in-memory)
             threads: Number of threads for query execution
             memory_limit: Memory limit (e.g., "2GB", "4GB")
+            extensions: Extensions to load; all default extensions when None. Pipelines
+                pass only what their adapters need, skipping unused extension loads.
         """
         self.db_path = db_path
         self.threads = threads
         self.memory_limit = memory_limit
+        self.extensions = frozenset(extensions) if extensions is not None else None
+        self._loaded_extensions: set[str] = set()
+        # Attachment alias -> connection fingerprint, for attachments kept open between
+        # runs on a long-lived (pooled) engine
+        self.attachments: dict[str, str] = {}
         self.con: Optional[duckdb.DuckDBPyConnection] = None
 
     def __enter__(self) -> duckdb.DuckDBPyConnection:
@@ -65,47 +87,105 @@ class DuckDBEngine:
 
     def _configure(self):
         """Configure DuckDB with extensions and settings."""
-        # Load required extensions
-        required_extensions = ["postgres", "httpfs"]
-        optional_extensions = ["snowflake"]
+        self.load_extensions(self._selected(REQUIRED_EXTENSIONS + OPTIONAL_EXTENSIONS))
+
+        # Set performance parameters
+        try:
+            self.con.execute(f"PRAGMA threads={self.threads};")
+            self.con.execute(f"SET memory_limit='{self.memory_limit}';")
+            logger.debug(f"Set threads={self.threads}, memory_limit={self.memory_limit}")
+        except Exception as e:
+            logger.error(f"Failed to set DuckDB parameters: {e}")
+            raise DuckDBEngineError(f"Failed to configure DuckDB: {e}") from e
 
-        for ext in required_extensions:
+    def load_extensions(self, extensions: Iterable[str]):
+        """
+        Install and load extensions that this engine has not loaded yet.
+
+        Called at startup and again by runs on a long-lived engine that need an
+        extension it was not created with.
+
+        Args:
+            extensions: Extension names; optional ones only log a warning on failure
+
+        Raises:
+            DuckDBEngineError: If a non-optional extension fails to load
+        """
+        wanted = [ext for ext in extensions if ext not in self._loaded_extensions]
+        if not wanted:
+            return
+
+        # One probe tells us what is already installed/loaded (e.g. autoloaded or cached)
+        ext_state = self._extension_state(wanted)
+
+        for ext in wanted:
             try:
-                logger.debug(f"Installing extension: {ext}")
-                self.con.execute(f"INSTALL {ext};")
-                self.con.execute(f"LOAD {ext};")
-                logger.info(f"Loaded extension: {ext}")
+                self._install_and_load(ext, *ext_state.get(ext, (False, False)))
             except Exception as e:
+                if ext in OPTIONAL_EXTENSIONS:
+                    logger.warning(f"Could not load optional extension {ext}: {e}")
+                    continue
                 logger.error(f"Failed to load required extension {ext}: {e}")
                 raise DuckDBEngineError(
                     f"Required extension {ext} failed to load. "
                     f"This extension is needed for the pipeline to function."
                 ) from e
+            self._loaded_extensions.add(ext)
+            logger.info(f"Loaded extension: {ext}")
 
-        for ext in optional_extensions:
-            try:
-                logger.debug(f"Installing optional extension: {ext}")
-                # Snowflake is a community extension, not in core
-                if ext == "snowflake":
-                    self.con.execute(f"INSTALL {ext} FROM community;")
-                else:
-                    self.con.execute(f"INSTALL {ext};")
-                self.con.execute(f"LOAD {ext};")
-                logger.info(f"Loaded optional extension: {ext}")
-            except Exception as e:
-                logger.warning(f"Could not load optional extension {ext}: {e}")
+            # Configure S3 access (the s3_* settings come with httpfs)
+            if ext == "httpfs":
+                self._configure_s3()
 
-        # Configure S3 access
-        self._configure_s3()
+    def _selected(self, extensions: tuple[str, ...]) -> list[str]:
+        """Filter default extensions down to the ones this engine was asked to load."""
+        if self.extensions is None:
+            return list(extensions)
+        return [ext for ext in extensions if ext in self.extensions]
 
-        # Set performance parameters
-        try:
-            self.con.execute(f"PRAGMA threads={self.threads};")
-            self.con.execute(f"SET memory_limit='{self.memory_limit}';")
-            logger.debug(f"Set threads={self.threads}, memory_limit={self.memory_limit}")
-        except Exception as e:
-            logger.error(f"Failed to set DuckDB parameters: {e}")
-            raise DuckDBEngineError(f"Failed to configure DuckDB: {e}") from e
+    def _extension_state(self, extensions: list[str]) -> dict[str, tuple[bool, bool]]:
+        """
+        Look up install/load state for several extensions with a single query.
+
+        Args:
+            extensions: Extension names to probe
+
+        Returns:
+            Mapping of extension name to (installed, loaded). Extensions unknown to
+            this DuckDB build (e.g. community extensions not yet installed) are omitted.
+        """
+        rows = self.con.execute(
+            "SELECT extension_name, aliases, installed, loaded FROM duckdb_extensions() "
+            "WHERE list_contains($names, extension_name) OR list_has_any(aliases, $names)",
+            {"names": extensions},
+        ).fetchall()
+        # Extensions may be listed under their canonical name (postgres -> postgres_scanner)
+        state = {}
+        for name, aliases, installed, loaded in rows:
+            for key in [name, *(aliases or [])]:
+                if key in extensions:
+                    state[key] = (bool(installed), bool(loaded))
+        return state
+
+    def _install_and_load(self, ext: str, installed: bool, loaded: bool):
+        """
+        Issue only the INSTALL/LOAD statements an extension still needs, in one call.
+
+        Args:
+            ext: Extension name
+            installed: Whether the extension is already installed
+            loaded: Whether the extension is already loaded
+        """
+        statements = []
+        if not installed:
+            # Snowflake is a community extension, not in core
+            source = " FROM community" if ext in COMMUNITY_EXTENSIONS else ""
+            statements.append(f"INSTALL {ext}{source};")
+        if not loaded:
+            statements.append(f"LOAD {ext};")
+        if statements:
+            logger.debug(f"Installing extension: {ext}")
+            self.con.execute(" ".join(statements))
 
     def _configure_s3(self):
         """Configure S3 access with proper credential handling."""
@@ -140,14 +220,3 @@ def make_con(db_path: str = ":memory:", threads: int = 4, memory_limit: str = "2
     """
     with DuckDBEngine(db_path, threads, memory_limit) as con:
         yield con
-
-
-def resolve_env_tokens(s: str) -> str:
-    """
-    Legacy function for backward compatibility.
-
-    Moved to config.py - import from there instead.
-    """
-    from .config import resolve_env_tokens as resolve
-
-    return resolve(s)
@@ -5,21 +5,34 @@ Provides centralized logging configuration with console and file handlers.
 """
 
 import logging
+import os
 import sys
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
 
 def setup_logger(
-    name: str = "duckel", level: str = "INFO", log_file: Optional[str] = None
+    name: str = "duckel",
+    level: str = "INFO",
+    log_file: Optional[str] = None,
+    max_bytes: int = 5_000_000,
+    backup_count: int = 3,
 ) -> logging.Logger:
     """
     Configure structured logging for DuckEL.
 
+    Rotation renames the file from inside the writing process, so only one
+    process should write a given log_file. Other processes sharing the
+    working directory (a CLI run next to the UI, say) need their own log_file;
+    the default logger reads it from DUCKEL_LOG_FILE.
+
     Args:
         name: Logger name (default: "duckel")
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional path to log file
+        max_bytes: Size at which the log file is rotated to log_file.1 (0 disables)
+        backup_count: Rotated files kept as log_file.1 .. log_file.N
 
     Returns:
         Configured logger instance
@@ -47,7 +60,10 @@ def setup_logger(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        file_handler = logging.FileHandler(log_file)
+        # Rotation bounds the file the UI's log tab reads. It is not coordinated
+        # across processes: another writer keeps appending to the renamed file
+        # (or, on Windows, blocks the rename)
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
@@ -55,5 +71,6 @@ def setup_logger(
     return logger
 
 
-# Default logger instance - always write to file for observability
-logger = setup_logger(log_file="duckel.log")
+# Default logger instance - always write to file for observability. A second process
+# running beside the UI should set DUCKEL_LOG_FILE so duckel.log keeps a single writer
+logger = setup_logger(log_file=os.getenv("DUCKEL_LOG_FILE", "duckel.log"))
@@ -7,7 +7,12 @@ Provides type-safe configuration with automatic validation.
 import re
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+# Applied with fullmatch: "$" would also accept a trailing newline
+_SOURCE_IDENT_RE = re.compile(r"[a-zA-Z0-9_\.]+")
+_TARGET_IDENT_RE = re.compile(r"[a-zA-Z0-9_\.,]+")  # Comma allowed for composite keys
+_MEM_RE = re.compile(r"\d+[KMGT]B")
 
 
 class SourceConfig(BaseModel):
@@ -40,7 +45,7 @@ class SourceConfig(BaseModel):
     @classmethod
     def sanitize_identifier(cls, v: Optional[str]) -> Optional[str]:
         """Sanitize SQL identifiers to prevent injection."""
-        if v and not re.match(r"^[a-zA-Z0-9_\.]+$", v):
+        if v and not _SOURCE_IDENT_RE.fullmatch(v):
             raise ValueError(
                 f"Invalid SQL identifier: {v}. Only alphanumeric, underscore, and dot allowed."
             )
@@ -93,7 +98,7 @@ class TargetConfig(BaseModel):
     @classmethod
     def sanitize_identifier(cls, v: Optional[str]) -> Optional[str]:
         """Sanitize SQL identifiers to prevent injection."""
-        if v and not re.match(r"^[a-zA-Z0-9_\.,]+$", v):  # Added comma support for composite keys
+        if v and not _TARGET_IDENT_RE.fullmatch(v):
             raise ValueError(
                 f"Invalid SQL identifier: {v}. Only alphanumeric, underscore, dot, and comma allowed."
             )
@@ -103,18 +108,50 @@ class TargetConfig(BaseModel):
 class PipelineOptions(BaseModel):
     """Runtime options for pipeline execution."""
 
+    # get_options hands one instance to every caller (including concurrent runs)
+    model_config = ConfigDict(frozen=True)
+
     threads: int = Field(default=4, ge=1, le=64)
-    memory_limit: str = Field(default="2GB", pattern=r"^\d+[KMGT]B$")
+    memory_limit: str = "2GB"
     compute_counts: bool = True
     sample_data: bool = True
     sample_rows: int = Field(default=50, ge=1, le=100000)
     compute_summary: bool = False
+    # Summarize the sampled rows instead of the full relation (set False for population stats)
+    summary_from_sample: bool = True
+    # "fast" profiles min/max/approx_unique/avg/nulls in one aggregate pass instead of
+    # SUMMARIZE (no std or quantiles)
+    summary_mode: Literal["full", "fast"] = "full"
+    # "estimate" accepts catalog row estimates (e.g. Postgres reltuples) for unfiltered
+    # sources read in place; staged sources are always counted exactly
+    count_mode: Literal["exact", "estimate"] = "exact"
+    # Take the row count from the write instead of a separate COUNT(*) scan
+    count_via_write: bool = False
+    # Keep all threads for writes into Postgres/Snowflake (normally limited to one)
+    force_parallel_write: bool = False
+    # Run count, sample and summary concurrently on separate cursors
+    parallel_metrics: bool = True
+    # Stage the source in a local table before the read stages and the write;
+    # None stages remote (Postgres/Snowflake) sources only
+    materialize: Optional[bool] = None
+    # Also report DuckDB's own per-query latency (profiler) next to wall-clock timings
+    profile_queries: bool = False
 
     # New options for incremental and evolution
     full_refresh: bool = False
     schema_evolution: Literal["ignore", "fail", "evolve"] = "ignore"
     ignore_watermark: bool = False
 
+    @field_validator("memory_limit")
+    @classmethod
+    def validate_memory_limit(cls, v: str) -> str:
+        """Validate memory limits such as '512MB' or '4GB'."""
+        if not _MEM_RE.fullmatch(v):
+            raise ValueError(
+                f"Invalid memory limit: {v}. Expected a size such as '512MB' or '4GB'."
+            )
+        return v
+
 
 class PipelineConfig(BaseModel):
     """Complete pipeline configuration."""
@@ -123,6 +160,9 @@ class PipelineConfig(BaseModel):
     target: TargetConfig
     options: dict[str, Any] = Field(default_factory=dict)
 
+    # (copy of options it was built from, validated options)
+    _cached_options: Optional[tuple[dict[str, Any], PipelineOptions]] = PrivateAttr(default=None)
+
     def get_options(self, overrides: Optional[dict[str, Any]] = None) -> PipelineOptions:
         """
         Get pipeline options with overrides applied.
@@ -131,9 +171,18 @@ class PipelineConfig(BaseModel):
             overrides: Optional dictionary of option overrides
 
         Returns:
-            Validated PipelineOptions instance
+            Validated, frozen PipelineOptions instance. Without overrides (None or
+            empty) the same instance is returned while options is unchanged.
         """
-        opts = {**self.options}
-        if overrides:
-            opts.update(overrides)
-        return PipelineOptions(**opts)
+        if not overrides:
+            # Keyed on the contents, so edits to options are picked up
+            cached = self._cached_options
+            if cached is None or cached[0] != self.options:
+                cached = self._cached_options = (
+                    dict(self.options),
+                    PipelineOptions(**self.options),
+                )
+            return cached[1]
+
+        # Overrides come from the UI and callers, so they are validated in full
+        return PipelineOptions(**{**self.options, **overrides})
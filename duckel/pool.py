@@ -0,0 +1,96 @@
+"""
+Pool of warm DuckDB engines reused across pipeline runs.
+"""
+
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .engine import DuckDBEngine
+from .logger import logger
+
+
+class EnginePool:
+    """
+    Idle DuckDB engines keyed by (threads, memory_limit).
+
+    An acquired engine belongs to one caller until it is released, so concurrent
+    runs never share stage tables or attachment names. Extensions an engine has
+    loaded, and its Postgres/Snowflake attachments, stay open for the next run
+    that acquires it.
+
+    Usage:
+        with pool.acquire(threads=4, memory_limit="2GB") as engine:
+            PipelineRunner(config, engine=engine).run()
+    """
+
+    def __init__(self, max_idle: int = 4):
+        """
+        Initialize an empty pool.
+
+        Args:
+            max_idle: Idle engines kept per (threads, memory_limit); extras are closed
+        """
+        self.max_idle = max_idle
+        self._idle: dict[tuple[int, str], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _idle_queue(self, key: tuple[int, str]) -> queue.LifoQueue:
+        with self._lock:
+            if key not in self._idle:
+                self._idle[key] = queue.LifoQueue(maxsize=self.max_idle)
+            return self._idle[key]
+
+    @contextmanager
+    def acquire(self, threads: int, memory_limit: str) -> Iterator[DuckDBEngine]:
+        """
+        Borrow an open engine, creating one if none is idle.
+
+        Args:
+            threads: DuckDB thread count
+            memory_limit: DuckDB memory limit
+
+        Yields:
+            Open DuckDBEngine (extensions are loaded on demand by the runner)
+        """
+        idle = self._idle_queue((threads, memory_limit))
+        try:
+            engine = idle.get_nowait()
+        except queue.Empty:
+            engine = DuckDBEngine(threads=threads, memory_limit=memory_limit, extensions=())
+            engine.__enter__()
+
+        try:
+            yield engine
+        finally:
+            self._release(idle, engine)
+
+    def _release(self, idle: queue.LifoQueue, engine: DuckDBEngine):
+        """Return a healthy engine to its idle queue, or close it."""
+        try:
+            engine.con.execute("SELECT 1").fetchone()
+            idle.put_nowait(engine)
+            return
+        except queue.Full:
+            pass
+        except Exception as e:
+            logger.warning(f"Discarding unusable DuckDB engine: {e}")
+        engine.__exit__(None, None, None)
+
+    def close(self):
+        """Close all idle engines."""
+        with self._lock:
+            queues = list(self._idle.values())
+            self._idle.clear()
+        for idle in queues:
+            while True:
+                try:
+                    engine = idle.get_nowait()
+                except queue.Empty:
+                    break
+                engine.__exit__(None, None, None)
+
+
+# Shared by run_pipeline (and the scheduler jobs that call it)
+default_pool = EnginePool()
@@ -5,6 +5,7 @@ Using APScheduler's BackgroundScheduler.
 
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -13,6 +14,23 @@ from apscheduler.triggers.date import DateTrigger
 logger = logging.getLogger("duckel.scheduler")
 
 
+@lru_cache(maxsize=1024)
+def _cron_trigger(cron_expr: str) -> CronTrigger:
+    """
+    Parse a crontab expression once; triggers hold no per-job state and can be shared.
+
+    from_crontab captures the local timezone when the expression is first parsed,
+    so a cached trigger keeps that timezone even if the process's zone changes.
+    """
+    return CronTrigger.from_crontab(cron_expr)
+
+
+@lru_cache(maxsize=1024)
+def _date_trigger(run_at: datetime) -> DateTrigger:
+    """Build a one-off trigger once per run time."""
+    return DateTrigger(run_date=run_at)
+
+
 class SchedulerManager:
     """
     Singleton-like wrapper for BackgroundScheduler.
@@ -38,13 +56,13 @@ class SchedulerManager:
         """
         trigger = None
         if run_at:
-            trigger = DateTrigger(run_date=run_at)
+            trigger = _date_trigger(run_at)
         elif cron_expr:
             # Simple cron parsing: assume standard unix 5-part cron, or let APScheduler parse kwargs if broken down
             # For simplicity, we'll try to parse a string "min hour day month dow"
             # But better to just let user pass explicit args?
             # Or use CronTrigger.from_crontab(cron_expr)
-            trigger = CronTrigger.from_crontab(cron_expr)
+            trigger = _cron_trigger(cron_expr)
 
         if not trigger:
             raise ValueError("Must provide either run_at or cron_expr")
@@ -9,7 +9,7 @@ os.makedirs("data", exist_ok=True)
 # Generate sample Telco data
 n_rows = 50
 data = {
-    "customer_id": [f"CUST-{i:04d}" for i in range(n_rows)],
+    "customer_id": np.char.add("CUST-", np.char.zfill(np.arange(n_rows).astype(str), 4)),
     "gender": np.random.choice(["Male", "Female"], n_rows),
     "senior_citizen": np.random.choice([0, 1], n_rows),
     "tenure": np.random.randint(1, 72, n_rows),
@@ -41,7 +41,8 @@ def launch():
     os.makedirs(log_file.parent, exist_ok=True)
 
     # Use pg_ctl to start
-    # We pass the port via -o
+    # We pass the port via -o; -w blocks until the server accepts connections
+    # (or the -t timeout expires), so no readiness polling is needed
     cmd = [
         os.path.join(PG_BIN, "pg_ctl.exe"),
         "-D",
@@ -50,6 +51,9 @@ def launch():
         f"-p {PG_PORT}",
         "-l",
         str(log_file),
+        "-w",
+        "-t",
+        "60",
         "start",
     ]
 
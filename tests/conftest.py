@@ -6,14 +6,17 @@ and S3 clients for end-to-end testing across all source/target combinations.
 """
 
 import os
+import socket
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent
+INTEGRATION_CONFIG = PROJECT_ROOT / "configs" / "pipelines_integration.yml"
 
 
 @pytest.fixture(scope="session")
@@ -37,9 +40,8 @@ def docker_services():
         cwd=PROJECT_ROOT,
     )
 
-    # Wait for services to be ready
-    _wait_for_postgres()
-    _wait_for_minio()
+    # --wait blocks on the compose healthchecks; this is only a short safety net
+    _wait_for_services()
 
     yield  # Run tests
 
@@ -50,52 +52,68 @@ def docker_services():
     )
 
 
-def _wait_for_postgres(max_retries: int = 30, delay: float = 1.0):
-    """Wait for Postgres to be ready."""
+def _wait(probe, name: str, max_retries: int = 6):
+    """Call probe() until it returns True, backing off from 50 ms up to 1 s."""
+    for i in range(max_retries):
+        if probe():
+            print(f"[Fixture] {name} is ready after {i + 1} attempts")
+            return
+        time.sleep(min(0.05 * 2**i, 1.0))
+
+    raise RuntimeError(f"{name} did not become ready in time")
+
+
+def _postgres_ready() -> bool:
+    """Probe Postgres: a cheap TCP connect first, then a full handshake."""
     import psycopg2
 
     conn_str = "host=localhost port=5432 dbname=testdb user=testuser password=testpass"
 
-    for i in range(max_retries):
-        try:
-            conn = psycopg2.connect(conn_str)
-            conn.close()
-            print(f"[Fixture] Postgres is ready after {i + 1} attempts")
-            return
-        except psycopg2.OperationalError:
-            time.sleep(delay)
-
-    raise RuntimeError("Postgres did not become ready in time")
+    try:
+        socket.create_connection(("localhost", 5432), timeout=0.5).close()
+        psycopg2.connect(conn_str).close()
+        return True
+    except (OSError, psycopg2.OperationalError):
+        return False
 
 
-def _wait_for_minio(max_retries: int = 30, delay: float = 1.0):
-    """Wait for MinIO to be ready."""
+def _minio_ready() -> bool:
+    """Probe the MinIO liveness endpoint."""
     import requests
 
     url = os.getenv("S3_ENDPOINT", "http://localhost:9000") + "/minio/health/live"
 
-    for i in range(max_retries):
-        try:
-            resp = requests.get(url, timeout=2)
-            if resp.status_code == 200:
-                print(f"[Fixture] MinIO is ready after {i + 1} attempts")
-                return
-        except requests.RequestException:
-            pass
-        time.sleep(delay)
+    try:
+        return requests.get(url, timeout=2).status_code == 200
+    except requests.RequestException:
+        return False
 
-    raise RuntimeError("MinIO did not become ready in time")
+
+def _wait_for_services():
+    """Wait for Postgres and MinIO concurrently."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_wait, _postgres_ready, "Postgres"),
+            executor.submit(_wait, _minio_ready, "MinIO"),
+        ]
+        for future in futures:
+            future.result()
 
 
 @pytest.fixture(scope="session")
-def postgres_connection(docker_services):
-    """Provide a Postgres connection for tests."""
-    import psycopg2
+def postgres_pool(docker_services):
+    """
+    Provide a Postgres connection pool for tests.
+
+    Borrow with getconn() and hand back with putconn() so the session pays for
+    each connection handshake only once.
+    """
+    from psycopg2.pool import ThreadedConnectionPool
 
     conn_str = "host=localhost port=5432 dbname=testdb user=testuser password=testpass"
-    conn = psycopg2.connect(conn_str)
-    yield conn
-    conn.close()
+    pool = ThreadedConnectionPool(1, 4, dsn=conn_str)
+    yield pool
+    pool.closeall()
 
 
 @pytest.fixture(scope="session")
@@ -117,43 +135,107 @@ def s3_client(docker_services):
 
 
 @pytest.fixture(scope="session")
-def test_data(docker_services, postgres_connection, s3_client):
+def test_data(docker_services, postgres_pool, s3_client):
     """
     Generate and seed test data to all sources.
 
-    This creates the test DataFrame, saves it locally, seeds Postgres,
+    This creates the test Arrow table, saves it locally, seeds Postgres,
     and uploads to S3.
     """
     from tests.generate_test_data import (
-        generate_test_dataframe,
+        generate_test_table,
         save_parquet,
         seed_postgres,
         upload_to_minio,
     )
 
-    df = generate_test_dataframe(100)
-    parquet_path = save_parquet(df, "integration_test_data.parquet")
-    seed_postgres(df, "integration_source")
+    # Arrow tables are immutable, so tests cannot alter the shared snapshot
+    table = generate_test_table(100)
+    parquet_path = save_parquet(table, "integration_test_data.parquet")
+    conn = postgres_pool.getconn()
+    try:
+        seed_postgres(table, "integration_source", conn=conn)
+    finally:
+        postgres_pool.putconn(conn)
     upload_to_minio(parquet_path, "testbucket", "integration_test_data.parquet")
 
-    return df
+    return table
 
 
-@pytest.fixture
-def duckdb_env():
+@pytest.fixture(scope="session")
+def integration_pipelines():
     """
-    Set environment variables for DuckDB S3 access to MinIO.
+    Load all integration pipelines once per session.
+
+    The configs are shared between tests; PipelineRunner does not mutate them.
     """
-    original_env = os.environ.copy()
+    from duckel.config import load_config
+
+    return load_config(str(INTEGRATION_CONFIG))
 
-    os.environ["AWS_ACCESS_KEY_ID"] = os.getenv("AWS_ACCESS_KEY_ID", "minioadmin")
-    os.environ["AWS_SECRET_ACCESS_KEY"] = os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin")
-    os.environ["AWS_REGION"] = "us-east-1"
-    # For MinIO, we need to set the endpoint
-    os.environ["S3_ENDPOINT"] = os.getenv("S3_ENDPOINT", "http://localhost:9000")
 
-    yield
+@pytest.fixture(scope="session")
+def integration_output_dirs(integration_pipelines):
+    """Create the parent directory of every local integration target once per session."""
+    parents = {
+        Path(pipeline.target.path).parent
+        for pipeline in integration_pipelines.values()
+        if pipeline.target.path and "://" not in pipeline.target.path
+    }
+    for parent in parents:
+        parent.mkdir(parents=True, exist_ok=True)
+    return parents
 
-    # Restore original
-    os.environ.clear()
-    os.environ.update(original_env)
+
+@pytest.fixture(scope="session")
+def duckdb_con_with_extensions():
+    """
+    Provide one DuckDB connection with the default extensions loaded.
+
+    INSTALL/LOAD runs once per session; tests take a cursor() from it, which
+    shares the loaded extensions without paying for them again.
+    """
+    from duckel.engine import DuckDBEngine
+
+    with DuckDBEngine() as con:
+        yield con
+
+
+@pytest.fixture
+def duckdb_cursor(duckdb_con_with_extensions):
+    """Provide a per-test cursor on the shared extension-loaded connection."""
+    with duckdb_con_with_extensions.cursor() as con:
+        yield con
+
+
+@pytest.fixture(scope="session")
+def duckdb_setup_con():
+    """Provide one plain DuckDB connection for tests that only use it to prepare data."""
+    import duckdb
+
+    with duckdb.connect() as con:
+        yield con
+
+
+@pytest.fixture
+def duckdb_setup_cursor(duckdb_setup_con):
+    """Provide a per-test cursor for setup SQL; its TEMP tables are private to the test."""
+    with duckdb_setup_con.cursor() as con:
+        yield con
+
+
+@pytest.fixture(scope="session")
+def duckdb_env():
+    """
+    Set environment variables for DuckDB S3 access to MinIO.
+
+    Session-scoped: the values never change between tests, and the original
+    environment is restored once the session ends.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AWS_ACCESS_KEY_ID", os.getenv("AWS_ACCESS_KEY_ID", "minioadmin"))
+        mp.setenv("AWS_SECRET_ACCESS_KEY", os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin"))
+        mp.setenv("AWS_REGION", "us-east-1")
+        # For MinIO, we need to set the endpoint
+        mp.setenv("S3_ENDPOINT", os.getenv("S3_ENDPOINT", "http://localhost:9000"))
+        yield
@@ -5,61 +5,67 @@ Creates Parquet, CSV, and database tables containing diverse datatypes
 to verify type fidelity across all source/target combinations.
 """
 
+import io
 import os
-from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Union
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 # Data directory
 DATA_DIR = Path(__file__).parent / "data"
 
 
-def generate_test_dataframe(num_rows: int = 100) -> pd.DataFrame:
+def generate_test_table(num_rows: int = 100) -> pa.Table:
     """
-    Generate a DataFrame with diverse datatypes for testing.
+    Generate an Arrow table with diverse datatypes for testing.
+
+    Columns are built straight into Arrow arrays, so writing Parquet needs no
+    pandas conversion.
 
     Datatypes covered:
     - Integer (int64)
     - Float (float64)
-    - String (object)
+    - String (string)
     - Boolean (bool)
-    - Timestamp (datetime64[ns])
-    - Date (datetime64[ns] - date only)
+    - Timestamp (timestamp[ns])
+    - Date (timestamp[ns] - date only)
     """
     np.random.seed(42)  # Reproducibility
 
-    base_date = datetime(2024, 1, 1)
-
-    data = {
-        "id": list(range(1, num_rows + 1)),
-        "int_col": np.random.randint(0, 10000, size=num_rows),
-        "float_col": np.random.uniform(0.0, 1000.0, size=num_rows).round(4),
-        "string_col": [f"row_{i}_data" for i in range(num_rows)],
-        "bool_col": np.random.choice([True, False], size=num_rows),
-        "timestamp_col": [base_date + timedelta(seconds=i * 3600) for i in range(num_rows)],
-        "date_col": [(base_date + timedelta(days=i % 365)).date() for i in range(num_rows)],
-    }
-
-    df = pd.DataFrame(data)
+    base_date = np.datetime64("2024-01-01", "ns")
+    row_numbers = np.arange(num_rows)
+    row_labels = np.char.add(np.char.add("row_", row_numbers.astype(str)), "_data")
+
+    return pa.table(
+        {
+            "id": pa.array(np.arange(1, num_rows + 1), pa.int64()),
+            "int_col": pa.array(np.random.randint(0, 10000, size=num_rows), pa.int64()),
+            "float_col": pa.array(np.random.uniform(0.0, 1000.0, size=num_rows).round(4)),
+            "string_col": pa.array(row_labels),
+            "bool_col": pa.array(np.random.choice([True, False], size=num_rows)),
+            "timestamp_col": pa.array(base_date + row_numbers.astype("timedelta64[h]")),
+            "date_col": pa.array(base_date + (row_numbers % 365).astype("timedelta64[D]")),
+        }
+    )
 
-    # Set explicit types
-    df["id"] = df["id"].astype("int64")
-    df["int_col"] = df["int_col"].astype("int64")
-    df["float_col"] = df["float_col"].astype("float64")
-    df["bool_col"] = df["bool_col"].astype("bool")
-    df["timestamp_col"] = pd.to_datetime(df["timestamp_col"])
-    df["date_col"] = pd.to_datetime(df["date_col"])
 
-    return df
+def generate_test_dataframe(num_rows: int = 100) -> pd.DataFrame:
+    """Generate the test data as a pandas DataFrame (see generate_test_table)."""
+    return generate_test_table(num_rows).to_pandas()
 
 
-def save_parquet(df: pd.DataFrame, filename: str = "test_data.parquet"):
-    """Save DataFrame to Parquet file."""
+def save_parquet(data: Union[pa.Table, pd.DataFrame], filename: str = "test_data.parquet"):
+    """Save an Arrow table (or DataFrame) to a Parquet file."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     path = DATA_DIR / filename
-    df.to_parquet(path, index=False, engine="pyarrow")
+    if isinstance(data, pd.DataFrame):
+        data = pa.Table.from_pandas(data, preserve_index=False)
+    pq.write_table(data, path, compression="zstd")
     print(f"Saved Parquet: {path}")
     return path
 
@@ -73,16 +79,24 @@ def save_csv(df: pd.DataFrame, filename: str = "test_data.csv"):
     return path
 
 
-def seed_postgres(df: pd.DataFrame, table_name: str = "test_source"):
-    """Seed test data into Postgres."""
-    import psycopg2
-    from psycopg2.extras import execute_values
-
-    conn_str = os.getenv(
-        "PG_CONN_STR", "host=localhost port=5432 dbname=testdb user=testuser password=testpass"
-    )
+def seed_postgres(data: Union[pa.Table, pd.DataFrame], table_name: str = "test_source", conn=None):
+    """
+    Seed test data into Postgres.
 
-    conn = psycopg2.connect(conn_str)
+    Args:
+        data: Test data as an Arrow table (or DataFrame)
+        table_name: Table to (re)create
+        conn: Open psycopg2 connection to reuse (left open); connects from
+            PG_CONN_STR when omitted
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        import psycopg2
+
+        conn_str = os.getenv(
+            "PG_CONN_STR", "host=localhost port=5432 dbname=testdb user=testuser password=testpass"
+        )
+        conn = psycopg2.connect(conn_str)
     cur = conn.cursor()
 
     # Create table
@@ -101,16 +115,25 @@ def seed_postgres(df: pd.DataFrame, table_name: str = "test_source"):
     """
     )
 
-    # Insert data
+    # Bulk load in one COPY round trip instead of building per-row tuples
     cols = ["id", "int_col", "float_col", "string_col", "bool_col", "timestamp_col", "date_col"]
-    values = [tuple(row) for row in df[cols].values]
-    execute_values(cur, f"INSERT INTO {table_name} ({', '.join(cols)}) VALUES %s", values)
+    if isinstance(data, pd.DataFrame):
+        data = pa.Table.from_pandas(data, preserve_index=False)
+    table = data.select(cols)
+    # Written straight from the Arrow columns; date_col is narrowed to match the DATE column
+    date_idx = cols.index("date_col")
+    table = table.set_column(date_idx, "date_col", table["date_col"].cast(pa.date32()))
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf, pacsv.WriteOptions(include_header=False))
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table_name} ({', '.join(cols)}) FROM STDIN WITH (FORMAT CSV)", buf)
 
     conn.commit()
     cur.close()
-    conn.close()
+    if owns_conn:
+        conn.close()
 
-    print(f"Seeded Postgres table: {table_name} ({len(df)} rows)")
+    print(f"Seeded Postgres table: {table_name} ({table.num_rows} rows)")
 
 
 def upload_to_minio(filepath: Path, bucket: str = "testbucket", object_name: str = None):
@@ -137,15 +160,16 @@ def main():
     """Generate all test data."""
     print("Generating test data...")
 
-    df = generate_test_dataframe(100)
+    table = generate_test_table(100)
+    df = table.to_pandas()
 
     # Local files
-    parquet_path = save_parquet(df)
+    parquet_path = save_parquet(table)
     save_csv(df)
 
     # Optionally seed to services if available
     try:
-        seed_postgres(df)
+        seed_postgres(table)
     except Exception as e:
         print(f"Skipping Postgres seed: {e}")
 
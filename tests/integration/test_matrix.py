@@ -5,6 +5,7 @@ This module runs each pipeline from pipelines_integration.yml and verifies
 that data is correctly transferred to the target with type fidelity.
 """
 
+import functools
 import os
 
 # Add project root to path
@@ -14,39 +15,46 @@ from pathlib import Path
 import pytest
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from duckel.config import load_config
 from duckel.runner import PipelineRunner
 
 # Load integration pipelines
-INTEGRATION_CONFIG = Path(__file__).parent.parent.parent / "configs" / "pipelines_integration.yml"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+INTEGRATION_CONFIG = PROJECT_ROOT / "configs" / "pipelines_integration.yml"
 
 
-def get_pipeline_names():
-    """Get list of all pipeline names from integration config."""
+@functools.lru_cache(maxsize=1)
+def get_pipeline_names() -> tuple[str, ...]:
+    """Get all pipeline names from the integration config (parsed once)."""
     with open(INTEGRATION_CONFIG) as f:
-        config = yaml.safe_load(f)
-    return list(config.get("pipelines", {}).keys())
-
+        config = yaml.load(f, Loader=_Loader)
+    return tuple(config.get("pipelines", {}).keys())
 
-# Pipelines that require Snowflake (skip if no credentials)
-SNOWFLAKE_PIPELINES = [name for name in get_pipeline_names() if "snowflake" in name]
 
-# Pipelines that only need Docker (Postgres + MinIO)
-DOCKER_ONLY_PIPELINES = [name for name in get_pipeline_names() if "snowflake" not in name]
+def _partition_pipelines(names: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Split pipeline names into (Snowflake, Docker-only) in a single pass."""
+    snowflake, docker_only = [], []
+    for name in names:
+        (snowflake if "snowflake" in name else docker_only).append(name)
+    return tuple(snowflake), tuple(docker_only)
 
 
-def has_snowflake_creds() -> bool:
-    """Check if Snowflake credentials are configured."""
-    required = ["SF_USER", "SF_PASSWORD", "SF_ACCOUNT", "SF_WAREHOUSE", "SF_DATABASE", "SF_SCHEMA"]
-    return all(os.getenv(var) for var in required)
+# Pipelines that require Snowflake (skip if no credentials), and pipelines that
+# only need Docker (Postgres + MinIO)
+SNOWFLAKE_PIPELINES, DOCKER_ONLY_PIPELINES = _partition_pipelines(get_pipeline_names())
 
 
-@pytest.fixture(scope="module")
-def integration_pipelines():
-    """Load all integration pipelines."""
-    return load_config(str(INTEGRATION_CONFIG))
+# Checked once at import so the Snowflake class can be skipped at collection time
+HAS_SNOWFLAKE_CREDS = all(
+    os.getenv(var)
+    for var in ("SF_USER", "SF_PASSWORD", "SF_ACCOUNT", "SF_WAREHOUSE", "SF_DATABASE", "SF_SCHEMA")
+)
 
 
 class TestDockerOnlyPipelines:
@@ -61,20 +69,17 @@ class TestDockerOnlyPipelines:
     @pytest.mark.integration
     @pytest.mark.parametrize("pipeline_name", DOCKER_ONLY_PIPELINES)
     def test_pipeline_execution(
-        self, docker_services, test_data, duckdb_env, integration_pipelines, pipeline_name
+        self,
+        docker_services,
+        test_data,
+        duckdb_env,
+        integration_pipelines,
+        integration_output_dirs,
+        pipeline_name,
     ):
         """Execute a pipeline and verify it completes without error."""
-        if pipeline_name not in integration_pipelines:
-            pytest.skip(f"Pipeline {pipeline_name} not found in config")
-
         pipeline_config = integration_pipelines[pipeline_name]
 
-        # Create output directory if needed
-        if hasattr(pipeline_config.target, "path"):
-            out_path = Path(pipeline_config.target.path)
-            if not out_path.name.startswith("s3://"):
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-
         runner = PipelineRunner(pipeline_config, pipeline_name=pipeline_name)
         result = runner.run()
 
@@ -84,11 +89,13 @@ class TestDockerOnlyPipelines:
         assert result["rows"] > 0, f"Pipeline {pipeline_name} produced no rows"
 
         # Verify row count matches source
-        assert result["rows"] == len(
-            test_data
-        ), f"Row count mismatch: expected {len(test_data)}, got {result['rows']}"
+        expected_rows = test_data.num_rows
+        assert (
+            result["rows"] == expected_rows
+        ), f"Row count mismatch: expected {expected_rows}, got {result['rows']}"
 
 
+@pytest.mark.skipif(not HAS_SNOWFLAKE_CREDS, reason="Snowflake credentials not configured")
 class TestSnowflakePipelines:
     """
     Test pipelines that involve Snowflake.
@@ -103,15 +110,15 @@ class TestSnowflakePipelines:
     @pytest.mark.snowflake
     @pytest.mark.parametrize("pipeline_name", SNOWFLAKE_PIPELINES)
     def test_pipeline_execution(
-        self, docker_services, test_data, duckdb_env, integration_pipelines, pipeline_name
+        self,
+        docker_services,
+        test_data,
+        duckdb_env,
+        integration_pipelines,
+        integration_output_dirs,
+        pipeline_name,
     ):
         """Execute a Snowflake pipeline and verify it completes."""
-        if not has_snowflake_creds():
-            pytest.skip("Snowflake credentials not configured")
-
-        if pipeline_name not in integration_pipelines:
-            pytest.skip(f"Pipeline {pipeline_name} not found in config")
-
         pipeline_config = integration_pipelines[pipeline_name]
 
         runner = PipelineRunner(pipeline_config, pipeline_name=pipeline_name)
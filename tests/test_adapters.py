@@ -4,10 +4,13 @@ Unit tests for adapter classes.
 Tests SQL injection protection, input validation, and SQL generation.
 """
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from duckel.adapters import (
     Adapter,
+    AdapterError,
     CSVSourceAdapter,
     ParquetSourceAdapter,
     ParquetTargetAdapter,
@@ -44,13 +47,20 @@ class TestAdapterBase:
             ("table name", "Invalid SQL identifier"),  # space
             ("table-name", "Invalid SQL identifier"),  # hyphen
             ("table@name", "Invalid SQL identifier"),  # special char
+            ("table\n", "Invalid SQL identifier"),  # trailing newline
             ("", "Identifier cannot be empty"),  # empty - different message
         ]
 
-        for identifier, expected_msg in invalid_identifiers:
+        # Twice: rejections must not be served from the identifier cache
+        for identifier, expected_msg in invalid_identifiers * 2:
             with pytest.raises(ValueError, match=expected_msg):
                 Adapter._sanitize_identifier(identifier)
 
+    def test_quote_literal_escapes_quotes(self):
+        """Test that connection strings cannot break out of the ATTACH literal."""
+        assert Adapter._quote_literal("host=db") == "'host=db'"
+        assert Adapter._quote_literal("password=x' AS y; --") == "'password=x'' AS y; --'"
+
 
 class TestParquetSourceAdapter:
     """Test Parquet source adapter."""
@@ -72,6 +82,23 @@ class TestParquetSourceAdapter:
         sql = adapter.get_relation_sql()
         assert sql == "read_parquet('s3://bucket/path/file.parquet')"
 
+    def test_row_count_from_metadata(self):
+        """Test that Parquet row counts come from the file footers."""
+        adapter = ParquetSourceAdapter({"type": "parquet", "path": "./data/*.parquet"})
+        sql = adapter.get_row_count_sql()
+        assert sql == "SELECT SUM(num_rows) FROM parquet_file_metadata('./data/*.parquet')"
+        assert CSVSourceAdapter({"type": "csv", "path": "./a.csv"}).get_row_count_sql() is None
+
+    def test_required_extensions(self):
+        """Test that httpfs is only required for remote paths."""
+        local = ParquetSourceAdapter({"type": "parquet", "path": "./data/file.parquet"})
+        remote = ParquetSourceAdapter({"type": "parquet", "path": "s3://bucket/file.parquet"})
+        assert local.required_extensions() == frozenset()
+        assert remote.required_extensions() == {"httpfs"}
+        assert PostgresSourceAdapter({"type": "postgres", "conn": "x"}).required_extensions() == {
+            "postgres"
+        }
+
 
 class TestCSVSourceAdapter:
     """Test CSV source adapter."""
@@ -141,6 +168,37 @@ class TestPostgresSourceAdapter:
         sql = adapter.get_relation_sql()
         assert "SELECT * FROM users WHERE active = true" in sql
 
+    def test_row_count_estimate(self):
+        """Test that a catalog estimate is only offered when asked for and for tables."""
+        adapter = PostgresSourceAdapter(
+            {"type": "postgres", "conn": "test", "object": "public.users"}
+        )
+        assert adapter.get_row_count_sql() is None
+        sql = adapter.get_row_count_sql(estimate=True)
+        assert "postgres_query('pg_source_attachment'" in sql
+        assert "''public.users''::regclass" in sql
+
+        query_adapter = PostgresSourceAdapter(
+            {"type": "postgres", "conn": "test", "query": "SELECT 1"}
+        )
+        assert query_adapter.get_row_count_sql(estimate=True) is None
+
+    def test_ping(self):
+        """Test that ping round-trips through the attachment and wraps failures."""
+        adapter = PostgresSourceAdapter({"type": "postgres", "conn": "test", "name": "pg_src"})
+        con = MagicMock()
+        adapter.ping(con)
+        con.execute.assert_called_once_with("SELECT * FROM postgres_query('pg_src', 'SELECT 1')")
+
+        con.execute.side_effect = RuntimeError("connection refused")
+        with pytest.raises(AdapterError, match="pg_src"):
+            adapter.ping(con)
+
+        # File adapters have nothing to ping
+        file_con = MagicMock()
+        ParquetSourceAdapter({"type": "parquet", "path": "data.parquet"}).ping(file_con)
+        file_con.execute.assert_not_called()
+
 
 class TestParquetTargetAdapter:
     """Test Parquet target adapter."""
@@ -209,6 +267,16 @@ class TestPostgresTargetAdapter:
         assert "INSERT INTO" in sql
         assert "pg_target_attachment.users" in sql
 
+    def test_write_config_rejected_at_construction(self):
+        """Test that an unwritable target config fails before any data is read."""
+        with pytest.raises(ValueError, match="Invalid SQL identifier"):
+            PostgresTargetAdapter({"type": "postgres", "conn": "test", "table": "users;--"})
+
+        with pytest.raises(ValueError, match="unique_key"):
+            PostgresTargetAdapter(
+                {"type": "postgres", "conn": "test", "table": "users", "mode": "upsert"}
+            )
+
 
 class TestAdapterFactories:
     """Test adapter factory functions."""
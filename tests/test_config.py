@@ -9,7 +9,14 @@ import os
 import pytest
 from pydantic import ValidationError
 
-from duckel.config import load_config, resolve_env_tokens, resolve_secret_tokens
+from duckel.config import (
+    load_config,
+    resolve_conn_tokens,
+    resolve_env_tokens,
+    resolve_secret_tokens,
+    resolve_tokens_in_dict,
+    save_pipeline_config,
+)
 from duckel.models import PipelineConfig, PipelineOptions, SourceConfig, TargetConfig
 
 
@@ -49,6 +56,11 @@ class TestSourceConfig:
         with pytest.raises(ValidationError, match="Invalid SQL identifier"):
             SourceConfig(type="postgres", conn="test", object="users; DROP TABLE users;--")
 
+    def test_identifier_with_trailing_newline_rejected(self):
+        """Test that a trailing newline cannot slip past the identifier check."""
+        with pytest.raises(ValidationError, match="Invalid SQL identifier"):
+            SourceConfig(type="postgres", conn="test", object="users\n")
+
     def test_sql_injection_protection_in_name(self):
         """Test that SQL injection is blocked in name."""
         with pytest.raises(ValidationError, match="Invalid SQL identifier"):
@@ -113,6 +125,13 @@ class TestPipelineOptions:
         with pytest.raises(ValidationError):
             PipelineOptions(threads=100)
 
+    def test_memory_limit_validation(self):
+        """Test memory limit format validation."""
+        assert PipelineOptions(memory_limit="512MB").memory_limit == "512MB"
+
+        with pytest.raises(ValidationError, match="Invalid memory limit"):
+            PipelineOptions(memory_limit="2 gigabytes")
+
     def test_sample_rows_validation(self):
         """Test sample rows validation."""
         # Valid
@@ -149,6 +168,27 @@ class TestPipelineConfig:
         assert opts.threads == 4
         assert opts.sample_rows == 200
 
+    def test_get_options_without_overrides_is_cached(self):
+        """Test that option validation runs once when no overrides are given."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "parquet", "path": "./output.parquet"},
+            options={"sample_rows": 100},
+        )
+
+        assert config.get_options() is config.get_options()
+        assert config.get_options({}) is config.get_options()
+        assert config.get_options().sample_rows == 100
+        assert config.get_options({"sample_rows": 10}).sample_rows == 10
+
+        # The shared instance cannot be modified in place
+        with pytest.raises(ValidationError, match="frozen"):
+            config.get_options().sample_rows = 1
+
+        # Editing the options dict invalidates the cached instance
+        config.options["sample_rows"] = 20
+        assert config.get_options().sample_rows == 20
+
 
 class TestConfigLoading:
     """Test configuration file loading."""
@@ -175,6 +215,32 @@ pipelines:
         assert "test_pipeline" in pipelines
         assert pipelines["test_pipeline"].source.type == "parquet"
 
+    def test_load_config_reuses_unchanged_file(self, tmp_path, monkeypatch):
+        """Test that an unchanged file is served from the cache as independent copies."""
+        config_file = tmp_path / "pipelines.yml"
+        config_file.write_text(
+            """
+pipelines:
+  cached_pipeline:
+    source:
+      type: parquet
+      path: ./input.parquet
+    target:
+      type: parquet
+      path: ./output.parquet
+"""
+        )
+
+        first = load_config(str(config_file))
+        first["cached_pipeline"].options["threads"] = 1
+
+        import duckel.config
+
+        monkeypatch.setattr(duckel.config, "_load_pipeline_dicts", None)  # would fail if re-read
+        second = load_config(str(config_file))
+        assert second["cached_pipeline"] is not first["cached_pipeline"]
+        assert "threads" not in second["cached_pipeline"].options
+
     def test_load_config_file_not_found(self):
         """Test that missing config file raises error."""
         with pytest.raises(FileNotFoundError):
@@ -204,46 +270,294 @@ pipelines:
 """
         )
 
-        with pytest.raises(ValueError, match="Invalid configuration"):
+        with pytest.raises(ValueError, match="Invalid configuration for pipeline 'bad_pipeline'"):
+            load_config(str(config_file))
+
+    def test_load_config_only_selected_pipelines(self, tmp_path):
+        """Test that unselected pipelines are neither resolved nor validated."""
+        config_file = tmp_path / "pipelines.yml"
+        config_file.write_text(
+            """
+pipelines:
+  good_pipeline:
+    source:
+      type: parquet
+      path: ./input.parquet
+    target:
+      type: parquet
+      path: ./output.parquet
+  bad_pipeline:
+    source:
+      type: invalid_type
+      conn: password=__ENV:NONEXISTENT_VAR
+    target:
+      type: parquet
+      path: ./output.parquet
+"""
+        )
+
+        pipelines = load_config(str(config_file), only={"good_pipeline"})
+        assert list(pipelines) == ["good_pipeline"]
+
+    def test_load_config_only_still_rejects_plain_text_password(self, tmp_path):
+        """Test that a plain-text password in an unselected pipeline is still rejected."""
+        config_file = tmp_path / "pipelines.yml"
+        config_file.write_text(
+            """
+pipelines:
+  good_pipeline:
+    source:
+      type: parquet
+      path: ./input.parquet
+    target:
+      type: parquet
+      path: ./output.parquet
+  leaky_pipeline:
+    source:
+      type: postgres
+      conn: host=db password=hunter2
+      object: users
+    target:
+      type: parquet
+      path: ./output.parquet
+"""
+        )
+
+        with pytest.raises(ValueError, match="Plain-text passwords"):
+            load_config(str(config_file), only={"good_pipeline"})
+
+    def test_load_config_leaves_mapping_keys_unresolved(self, tmp_path):
+        """Test that tokens are resolved in values only, from YAML and from the sidecar."""
+        config_file = tmp_path / "pipelines.yml"
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "parquet", "path": "./output.parquet"},
+            options={"__ENV:DUCKEL_UNSET_KEY_VAR": "kept"},
+        )
+        config_file.write_text(
+            """
+pipelines:
+  keyed:
+    source:
+      type: parquet
+      path: ./input.parquet
+    target:
+      type: parquet
+      path: ./output.parquet
+    options:
+      __ENV:DUCKEL_UNSET_KEY_VAR: kept
+"""
+        )
+        from_yaml = load_config(str(config_file))["keyed"].options
+
+        save_pipeline_config(str(config_file), "saved", config)
+        assert (tmp_path / "pipelines.json").exists()
+        from_sidecar = load_config(str(config_file))["keyed"].options
+
+        assert from_yaml == from_sidecar == {"__ENV:DUCKEL_UNSET_KEY_VAR": "kept"}
+
+    def test_load_config_numeric_pipeline_name(self, tmp_path):
+        """Test that a numeric pipeline key loads under its string name."""
+        config_file = tmp_path / "pipelines.yml"
+        config_file.write_text(
+            """
+pipelines:
+  2024:
+    source:
+      type: parquet
+      path: ./input.parquet
+    target:
+      type: parquet
+      path: ./output.parquet
+"""
+        )
+
+        assert list(load_config(str(config_file))) == ["2024"]
+        assert list(load_config(str(config_file), only={"2024"})) == ["2024"]
+
+    def test_load_config_rejects_plain_text_password(self, tmp_path):
+        """Test that plain-text passwords in connection strings are rejected."""
+        config_file = tmp_path / "plain.yml"
+        config_file.write_text(
+            """
+pipelines:
+  pg_pipeline:
+    source:
+      type: postgres
+      conn: host=localhost password=hunter2
+      object: public.users
+    target:
+      type: parquet
+      path: ./output.parquet
+"""
+        )
+
+        with pytest.raises(ValueError, match="Plain-text passwords"):
             load_config(str(config_file))
 
+    def test_saved_config_uses_json_cache_until_yaml_changes(self, tmp_path):
+        """Test that the JSON sidecar is used until the YAML's mtime or size changes."""
+        config_file = tmp_path / "pipelines.yml"
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "parquet", "path": "./output.parquet"},
+        )
+        save_pipeline_config(str(config_file), "saved_pipeline", config)
+
+        sidecar = tmp_path / "pipelines.json"
+        assert sidecar.exists()
+        assert list(load_config(str(config_file))) == ["saved_pipeline"]
+
+        # A hand edit to the YAML makes the cache stale
+        config_file.write_text(config_file.read_text().replace("saved_pipeline", "edited"))
+        assert list(load_config(str(config_file))) == ["edited"]
+
+        # So does a same-size YAML restored with a timestamp older than the sidecar
+        save_pipeline_config(str(config_file), "saved_pipeline", config)
+        config_file.write_text(config_file.read_text().replace("saved_pipeline", "restored_pipe!"))
+        os.utime(config_file, ns=(1, 1))
+        assert "restored_pipe!" in load_config(str(config_file))
+
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    @pytest.mark.parametrize(
+        "option", ["start: 2024-01-01", "buckets:\n        1: low"], ids=["date", "int_key"]
+    )
+    def test_sidecar_skipped_for_values_json_would_change(
+        self, tmp_path, monkeypatch, use_orjson, option
+    ):
+        """Test that dates and integer keys load the same before and after a save."""
+        import duckel.config
+
+        if not use_orjson:
+            monkeypatch.setattr(duckel.config, "orjson", None)
+        config_file = tmp_path / "pipelines.yml"
+        config_file.write_text(
+            f"""
+pipelines:
+  first:
+    source:
+      type: parquet
+      path: ./input.parquet
+    target:
+      type: parquet
+      path: ./output.parquet
+    options:
+      {option}
+"""
+        )
+        before = load_config(str(config_file))["first"].options
+
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "parquet", "path": "./output.parquet"},
+        )
+        save_pipeline_config(str(config_file), "second", config)
+
+        assert not (tmp_path / "pipelines.json").exists()
+        assert load_config(str(config_file))["first"].options == before
+        assert load_config(str(config_file))["first"].options == before
+
+    def test_failed_save_keeps_existing_config(self, tmp_path, monkeypatch):
+        """Test that a save interrupted before the rename leaves the old file untouched."""
+        config_file = tmp_path / "pipelines.yml"
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "parquet", "path": "./output.parquet"},
+        )
+        save_pipeline_config(str(config_file), "first", config)
+        original = config_file.read_text()
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError, match="disk full"):
+            save_pipeline_config(str(config_file), "second", config)
+
+        assert config_file.read_text() == original
+        assert not (tmp_path / "pipelines.yml.tmp").exists()
+
 
 class TestEnvironmentTokens:
     """Test environment variable resolution."""
 
-    def test_resolve_env_tokens(self):
+    def test_resolve_env_tokens(self, monkeypatch):
         """Test resolving __ENV: tokens."""
-        os.environ["TEST_VAR"] = "test_value"
+        monkeypatch.setenv("TEST_VAR", "test_value")
 
         result = resolve_env_tokens("prefix__ENV:TEST_VARsuffix")
         assert result == "prefixtest_valuesuffix"
 
-        # Cleanup
-        del os.environ["TEST_VAR"]
+    def test_resolve_env_tokens_follows_env_changes(self, monkeypatch):
+        """Test that memoized substitutions are keyed on the current variable values."""
+        monkeypatch.setenv("TEST_VAR", "one")
+        assert resolve_env_tokens("x=__ENV:TEST_VAR") == "x=one"
+
+        monkeypatch.setenv("TEST_VAR", "two")
+        assert resolve_env_tokens("x=__ENV:TEST_VAR") == "x=two"
+
+    def test_resolve_tokens_in_nested_dict(self, monkeypatch):
+        """Test that tokens are resolved at any depth, including inside lists."""
+        monkeypatch.setenv("TEST_VAR", "value")
+        nested = {"a": [1, "__ENV:TEST_VAR", {"b": "__ENV:TEST_VAR"}], "n": None}
+        deep = leaf = {}
+        for _ in range(5000):  # deeper than the recursion limit
+            leaf["k"] = {}
+            leaf = leaf["k"]
+        leaf["k"] = "__ENV:TEST_VAR"
+
+        assert resolve_tokens_in_dict(nested) == {"a": [1, "value", {"b": "value"}], "n": None}
+        assert nested["a"][1] == "__ENV:TEST_VAR"  # input is left untouched
+        resolve_tokens_in_dict(deep)
 
     def test_resolve_env_tokens_not_found(self):
         """Test that a missing env var raises (secrets are required, not silently empty)."""
         with pytest.raises(ValueError):
             resolve_env_tokens("__ENV:NONEXISTENT_VAR")
 
+    def test_resolve_env_tokens_reports_all_missing(self):
+        """Test that every missing variable is reported in a single error."""
+        with pytest.raises(ValueError, match="MISSING_A, MISSING_B"):
+            resolve_env_tokens("__ENV:MISSING_B:__ENV:MISSING_A:__ENV:MISSING_B")
+
     def test_resolve_env_tokens_non_string(self):
         """Test that non-strings are returned as-is."""
         assert resolve_env_tokens(123) == 123
         assert resolve_env_tokens(None) is None
 
+    def test_resolve_conn_tokens_tracks_env_changes(self, monkeypatch):
+        """Test that a memoized connection string is re-resolved when its variables change."""
+        monkeypatch.setenv("TEST_CONN_PASS", "first")
+        conn = "host=db password=__ENV:TEST_CONN_PASS"
+
+        assert resolve_conn_tokens(conn) == "host=db password=first"
+        assert resolve_conn_tokens(conn) == "host=db password=first"
+
+        monkeypatch.setenv("TEST_CONN_PASS", "second")
+        assert resolve_conn_tokens(conn) == "host=db password=second"
+
+        monkeypatch.delenv("TEST_CONN_PASS")
+        with pytest.raises(ValueError, match="TEST_CONN_PASS"):
+            resolve_conn_tokens(conn)
+
 
 class TestSecretTokens:
     """Test secret resolution."""
 
-    def test_resolve_secret_tokens(self):
+    def test_resolve_secret_tokens(self, monkeypatch):
         """Test resolving SECRET: tokens."""
-        os.environ["TEST_SECRET"] = "secret_value"
+        monkeypatch.setenv("TEST_SECRET", "secret_value")
 
         result = resolve_secret_tokens("SECRET:TEST_SECRET")
         assert result == "secret_value"
 
-        # Cleanup
-        del os.environ["TEST_SECRET"]
+    def test_resolve_embedded_secret_tokens(self, monkeypatch):
+        """Test resolving SECRET: tokens embedded in a longer string."""
+        monkeypatch.setenv("TEST_SECRET", "secret_value")
+
+        result = resolve_secret_tokens("user=me password=SECRET:TEST_SECRET host=db")
+        assert result == "user=me password=secret_value host=db"
+        assert resolve_secret_tokens("no tokens here") == "no tokens here"
 
     def test_resolve_secret_tokens_not_found(self):
         """Test that a missing secret raises (secrets are required, not silently empty)."""
@@ -1,10 +1,23 @@
 from unittest.mock import MagicMock
 
+import duckdb
 import pytest
 
 from duckel.adapters import AdapterError, PostgresTargetAdapter
 
 
+def _mock_con(target_schema, source_schema):
+    """
+    Build a connection mock whose DESCRIBE results are the target then source schema.
+
+    The mock is specced on DuckDBPyConnection, so calls to methods the real
+    connection lacks fail instead of passing silently.
+    """
+    con = MagicMock(spec=duckdb.DuckDBPyConnection)
+    con.execute.return_value.fetchall.side_effect = [target_schema, source_schema]
+    return con
+
+
 def test_sync_schema_add_column():
     """Test that schema evolution adds missing columns."""
     config = {
@@ -15,15 +28,11 @@ def test_sync_schema_add_column():
     }
     adapter = PostgresTargetAdapter(config)
 
-    con = MagicMock()
-
-    # Mock DESCRIBE calls
-    # 1. Target schema: id (INT), name (VARCHAR) - line 247 in adapters.py
-    # 2. Source schema: id (INT), name (VARCHAR), new_col (VARCHAR) - line 267 in adapters.py
-    con.execute.return_value.fetchall.side_effect = [
-        [("id", "INTEGER"), ("name", "VARCHAR")],  # Target
-        [("id", "INTEGER"), ("name", "VARCHAR"), ("new_col", "VARCHAR")],  # Source
-    ]
+    # Mock DESCRIBE calls: target has id and name, source adds new_col
+    con = _mock_con(
+        [("id", "INTEGER"), ("name", "VARCHAR")],
+        [("id", "INTEGER"), ("name", "VARCHAR"), ("new_col", "VARCHAR")],
+    )
 
     relation_sql = "src_table"
     adapter.sync_schema(con, relation_sql)
@@ -42,13 +51,8 @@ def test_sync_schema_fail_mode():
         "schema_evolution": "fail",
     }
     adapter = PostgresTargetAdapter(config)
-    con = MagicMock()
-
     # Mock mismatch
-    con.execute.return_value.fetchall.side_effect = [
-        [("id", "INT")],  # Target
-        [("id", "INT"), ("col2", "INT")],  # Source
-    ]
+    con = _mock_con([("id", "INT")], [("id", "INT"), ("col2", "INT")])
 
     with pytest.raises(AdapterError, match="Schema mismatch"):
         adapter.sync_schema(con, "src")
@@ -63,13 +67,8 @@ def test_sync_schema_ignore_mode():
         "schema_evolution": "ignore",
     }
     adapter = PostgresTargetAdapter(config)
-    con = MagicMock()
-
     # Target exists but has same schema
-    con.execute.return_value.fetchall.side_effect = [
-        [("id", "INT")],  # Target
-        [("id", "INT")],  # Source
-    ]
+    con = _mock_con([("id", "INT")], [("id", "INT")])
 
     adapter.sync_schema(con, "src")
 
@@ -86,12 +85,7 @@ def test_sync_schema_override():
         "schema_evolution": "ignore",  # Default is ignore
     }
     adapter = PostgresTargetAdapter(config)
-    con = MagicMock()
-
-    con.execute.return_value.fetchall.side_effect = [
-        [("id", "INT")],  # Target
-        [("id", "INT"), ("new", "INT")],  # Source
-    ]
+    con = _mock_con([("id", "INT")], [("id", "INT"), ("new", "INT")])
 
     # Override with evolve
     adapter.sync_schema(con, "src", evolution_override="evolve")
@@ -2,7 +2,6 @@ import os
 from urllib.parse import urlparse
 
 import boto3
-import duckdb
 import pandas as pd
 import pytest
 
@@ -13,29 +12,22 @@ from duckel.runner import PipelineRunner, run_pipeline
 # These will be added in a future iteration.
 
 
-@pytest.fixture(scope="module")
-def setup_data():
-    """Create sample data for testing."""
-    data_dir = "./data/inbound"
-    os.makedirs(data_dir, exist_ok=True)
-
-    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
-
-    file_path = f"{data_dir}/test_data.parquet"
-    df.to_parquet(file_path, index=False)
-
-    yield file_path
+@pytest.fixture(scope="session")
+def setup_data(tmp_path_factory, duckdb_setup_con):
+    """Create sample data once per session, outside the working tree."""
+    file_path = tmp_path_factory.mktemp("inbound") / "test_data.parquet"
+    duckdb_setup_con.execute(
+        "COPY (SELECT i + 1 AS a, ['x', 'y', 'z'][i + 1] AS b FROM range(3) t(i)) "
+        f"TO '{file_path}' (FORMAT parquet)"
+    )
 
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    return str(file_path)
 
 
-def test_local_parquet_to_parquet(setup_data):
+def test_local_parquet_to_parquet(setup_data, tmp_path):
     """Test the local Parquet to Parquet pipeline using new PipelineRunner."""
     in_path = setup_data
-    out_dir = "./data/outbound"
-    os.makedirs(out_dir, exist_ok=True)
-    out_path = f"{out_dir}/test_data_copy.parquet"
+    out_path = str(tmp_path / "test_data_copy.parquet")
 
     # Test with new PipelineRunner class
     config = PipelineConfig(
@@ -52,8 +44,6 @@ def test_local_parquet_to_parquet(setup_data):
     df = pd.read_parquet(out_path)
     assert len(df) == 3
 
-    os.remove(out_path)
-
 
 # S3 tests are disabled by default to avoid dependency on credentials.
 # To run these, set the S3_TEST_BUCKET environment variable.
@@ -61,15 +51,16 @@ S3_TEST_BUCKET = os.environ.get("S3_TEST_BUCKET")
 
 
 @pytest.mark.skipif(not S3_TEST_BUCKET, reason="S3_TEST_BUCKET not set")
-def test_s3_parquet_to_local(setup_data):
+def test_s3_parquet_to_local(setup_data, tmp_path, duckdb_setup_cursor):
     """Test S3 to local Parquet pipeline."""
     in_path = setup_data
     s3_path = f"s3://{S3_TEST_BUCKET}/in/test_data.parquet"
-    out_path = "./data/outbound/s3_test_data_copy.parquet"
+    out_path = str(tmp_path / "s3_test_data_copy.parquet")
 
     # Upload to S3
-    con = duckdb.connect()
-    con.execute(f"COPY (SELECT * FROM read_parquet('{in_path}')) TO '{s3_path}' (FORMAT parquet);")
+    duckdb_setup_cursor.execute(
+        f"COPY (SELECT * FROM read_parquet('{in_path}')) TO '{s3_path}' (FORMAT parquet);"
+    )
 
     pipeline = {
         "source": {"type": "parquet", "path": s3_path},
@@ -84,8 +75,6 @@ def test_s3_parquet_to_local(setup_data):
     df = pd.read_parquet(out_path)
     assert len(df) == 3
 
-    os.remove(out_path)
-
     # Clean up S3
     parsed_url = urlparse(s3_path)
     s3 = boto3.client("s3")
@@ -93,7 +82,7 @@ def test_s3_parquet_to_local(setup_data):
 
 
 @pytest.mark.skipif(not S3_TEST_BUCKET, reason="S3_TEST_BUCKET not set")
-def test_local_parquet_to_s3(setup_data):
+def test_local_parquet_to_s3(setup_data, duckdb_setup_cursor):
     """Test local to S3 Parquet pipeline."""
     in_path = setup_data
     s3_path = f"s3://{S3_TEST_BUCKET}/out/test_data_copy.parquet"
@@ -108,8 +97,7 @@ def test_local_parquet_to_s3(setup_data):
     assert result["rows"] == 3
 
     # Verify the file exists on S3
-    con = duckdb.connect()
-    df = con.execute(f"SELECT * FROM read_parquet('{s3_path}');").fetchdf()
+    df = duckdb_setup_cursor.execute(f"SELECT * FROM read_parquet('{s3_path}');").fetchdf()
     assert len(df) == 3
 
     # Clean up S3
@@ -0,0 +1,55 @@
+"""
+Unit tests for the DuckDB engine pool.
+
+Tests engine reuse, per-caller isolation, and closing idle engines.
+"""
+
+from duckel.pool import EnginePool
+
+
+class TestEnginePool:
+    """Test engine reuse across acquisitions."""
+
+    def test_released_engine_is_reused(self):
+        """Test that an engine returns to the pool and is handed out again."""
+        pool = EnginePool()
+
+        with pool.acquire(2, "1GB") as first:
+            first.con.execute("CREATE TABLE kept AS SELECT 1 AS id")
+        with pool.acquire(2, "1GB") as second:
+            assert second is first
+            assert second.con.execute("SELECT id FROM kept").fetchone()[0] == 1
+
+        pool.close()
+
+    def test_concurrent_acquisitions_get_distinct_engines(self):
+        """Test that an engine is never shared by two callers at once."""
+        pool = EnginePool()
+
+        with pool.acquire(2, "1GB") as first, pool.acquire(2, "1GB") as second:
+            assert first is not second
+
+        pool.close()
+
+    def test_settings_are_pooled_separately(self):
+        """Test that engines with different settings are not mixed."""
+        pool = EnginePool()
+
+        with pool.acquire(2, "1GB") as first:
+            pass
+        with pool.acquire(2, "512MB") as second:
+            assert second is not first
+
+        pool.close()
+
+    def test_excess_and_broken_engines_are_closed(self):
+        """Test that engines beyond max_idle, or no longer usable, are not kept."""
+        pool = EnginePool(max_idle=1)
+
+        with pool.acquire(2, "1GB"), pool.acquire(2, "1GB"):
+            pass
+        assert pool._idle[(2, "1GB")].qsize() == 1
+
+        with pool.acquire(2, "1GB") as engine:
+            engine.con.close()
+        assert pool._idle[(2, "1GB")].qsize() == 0
@@ -4,45 +4,50 @@ Integration tests for pipeline runner.
 Tests end-to-end pipeline execution with error handling.
 """
 
+import duckdb
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 from duckel.models import PipelineConfig
-from duckel.runner import PipelineExecutionError, PipelineRunner
-
-
-@pytest.fixture
-def sample_parquet_file(tmp_path):
-    """Create a sample Parquet file for testing."""
-    df = pd.DataFrame(
-        {
-            "id": [1, 2, 3, 4, 5],
-            "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
-            "value": [10.5, 20.3, 15.7, 30.1, 25.9],
-        }
+from duckel.runner import PipelineExecutionError, PipelineRunner, run_pipeline
+
+
+@pytest.fixture(scope="session")
+def sample_parquet_file(tmp_path_factory, duckdb_setup_con):
+    """Create a sample Parquet file once; tests only read it."""
+    file_path = tmp_path_factory.mktemp("sample") / "sample.parquet"
+    duckdb_setup_con.execute(
+        "COPY (SELECT id::BIGINT AS id, name, value::DOUBLE AS value FROM (VALUES "
+        "(1, 'Alice', 10.5), (2, 'Bob', 20.3), (3, 'Charlie', 15.7), "
+        "(4, 'David', 30.1), (5, 'Eve', 25.9)) t(id, name, value)) "
+        f"TO '{file_path}' (FORMAT parquet)"
     )
 
-    file_path = tmp_path / "sample.parquet"
-    df.to_parquet(file_path, index=False)
-
     return file_path
 
 
 class TestPipelineRunnerSuccess:
     """Test successful pipeline execution."""
 
-    def test_parquet_to_parquet(self, sample_parquet_file, tmp_path):
-        """Test basic Parquet to Parquet pipeline."""
+    @pytest.mark.parametrize(
+        "run",
+        [
+            pytest.param(lambda cfg: PipelineRunner(PipelineConfig(**cfg)).run(), id="runner"),
+            pytest.param(lambda cfg: run_pipeline(cfg), id="legacy_run_pipeline"),
+        ],
+    )
+    def test_parquet_to_parquet(self, sample_parquet_file, tmp_path, run):
+        """Test basic Parquet to Parquet pipeline through both entrypoints."""
         output_path = tmp_path / "output.parquet"
 
-        config = PipelineConfig(
-            source={"type": "parquet", "path": str(sample_parquet_file)},
-            target={"type": "parquet", "path": str(output_path), "mode": "overwrite"},
+        result = run(
+            {
+                "source": {"type": "parquet", "path": str(sample_parquet_file)},
+                "target": {"type": "parquet", "path": str(output_path), "mode": "overwrite"},
+            }
         )
 
-        runner = PipelineRunner(config)
-        result = runner.run()
-
         # Verify results
         assert result["rows"] == 5
         assert result["sample"] is not None
@@ -78,13 +83,65 @@ class TestPipelineRunnerSuccess:
         runner = PipelineRunner(config, overrides)
         result = runner.run()
 
-        # Verify sample size
+        # Verify sample size (returned as Arrow; no pandas conversion in the runner)
+        assert isinstance(result["sample"], pa.Table)
         assert len(result["sample"]) == 3
 
         # Verify summary was generated
-        assert result["summary"] is not None
+        assert isinstance(result["summary"], pa.Table)
         assert len(result["summary"]) > 0
 
+    def test_summary_from_sample(self, sample_parquet_file, tmp_path):
+        """Test that the summary covers the sample unless population stats are requested."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+        overrides = {"sample_rows": 3, "compute_summary": True}
+
+        sampled = PipelineRunner(config, overrides).run()["summary"]
+        full = PipelineRunner(config, {**overrides, "summary_from_sample": False}).run()["summary"]
+
+        assert set(sampled.column("count").to_pylist()) == {3}
+        assert set(full.column("count").to_pylist()) == {5}
+
+    def test_fast_summary(self, sample_parquet_file, tmp_path):
+        """Test that summary_mode=fast profiles every column in one aggregate pass."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+        overrides = {"compute_summary": True, "summary_from_sample": False}
+
+        full = PipelineRunner(config, overrides).run()["summary"]
+        fast = PipelineRunner(config, {**overrides, "summary_mode": "fast"}).run()["summary"]
+
+        assert fast.column("column_name").to_pylist() == ["id", "name", "value"]
+        for key in ("column_type", "min", "max", "avg", "count"):
+            assert fast.column(key).to_pylist() == full.column(key).to_pylist()
+        assert fast.column("null_percentage").to_pylist() == [0, 0, 0]
+        assert "std" not in fast.column_names
+
+    def test_fast_summary_nested_columns(self, tmp_path, duckdb_setup_con):
+        """Test that summary_mode=fast only counts list and struct columns."""
+        source_path = tmp_path / "nested.parquet"
+        duckdb_setup_con.execute(
+            "COPY (SELECT [1, 2]::INTEGER[] AS ids, {'a': 1} AS info, 1.5::DOUBLE AS value) "
+            f"TO '{source_path}' (FORMAT parquet)"
+        )
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(source_path)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+
+        fast = PipelineRunner(config, {"compute_summary": True, "summary_mode": "fast"}).run()[
+            "summary"
+        ]
+
+        assert fast.column("avg").to_pylist() == [None, None, "1.5"]
+        assert fast.column("min").to_pylist()[:2] == [None, None]
+        assert fast.column("count").to_pylist() == [1, 1, 1]
+
     def test_disable_counts_and_sample(self, sample_parquet_file, tmp_path):
         """Test pipeline with counts and sample disabled."""
         output_path = tmp_path / "output.parquet"
@@ -129,6 +186,283 @@ class TestPipelineRunnerSuccess:
         for key, value in result["timings"].items():
             assert value >= 0
 
+    def test_count_via_write(self, sample_parquet_file, tmp_path):
+        """Test that the row count can come from the write instead of a COUNT(*) scan."""
+        output_path = tmp_path / "output.parquet"
+
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(output_path)},
+        )
+
+        result = PipelineRunner(config, {"count_via_write": True}).run()
+
+        assert result["rows"] == 5
+        assert result["timings"]["count_s"] == 0.0
+
+    def test_profile_queries(self, sample_parquet_file, tmp_path):
+        """Test that DuckDB-reported latencies are added to the timings when profiling."""
+        output_path = tmp_path / "output.parquet"
+
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(output_path)},
+        )
+
+        timings = PipelineRunner(config, {"profile_queries": True}).run()["timings"]
+
+        assert {"count_db_s", "sample_db_s", "write_db_s"} <= set(timings)
+        assert "write_db_s" not in PipelineRunner(config).run()["timings"]
+
+    def test_materialize_option_stages_local_source(self, sample_parquet_file, tmp_path):
+        """Test that materialize=True stages a local source once for all stages."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+
+        staged = PipelineRunner(config, {"materialize": True}).run()
+        direct = PipelineRunner(config).run()
+
+        assert staged["rows"] == direct["rows"] == 5
+        assert staged["timings"]["stage_s"] > 0
+        assert direct["timings"]["stage_s"] == 0.0
+
+    def test_count_estimate_only_for_unstaged_source(
+        self, sample_parquet_file, tmp_path, monkeypatch
+    ):
+        """Test that count_mode=estimate is used in place but staged rows are counted."""
+        from duckel.adapters import ParquetSourceAdapter
+
+        # Stand-in for a catalog estimate such as Postgres' reltuples
+        monkeypatch.setattr(
+            ParquetSourceAdapter,
+            "get_row_count_sql",
+            lambda self, estimate=False: "SELECT 42" if estimate else None,
+        )
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+        overrides = {"count_mode": "estimate"}
+
+        in_place = PipelineRunner(config, {**overrides, "materialize": False}).run()
+        staged = PipelineRunner(config, {**overrides, "materialize": True}).run()
+
+        assert in_place["rows"] == 42
+        assert staged["rows"] == 5
+
+    def test_sequential_metrics(self, sample_parquet_file, tmp_path):
+        """Test that read stages still run, in order, with parallel_metrics disabled."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+        progress = []
+
+        result = PipelineRunner(
+            config,
+            {"parallel_metrics": False, "compute_summary": True, "summary_from_sample": False},
+            progress_callback=lambda percent, message: progress.append(percent),
+        ).run()
+
+        assert result["rows"] == 5
+        assert result["sample"].num_rows == 5
+        assert result["summary"] is not None
+        stages_start = progress.index(20) + 1
+        assert progress[stages_start : stages_start + 3] == [30, 40, 50]
+
+    def test_is_single_statement(self):
+        """Test detection of single-statement writes that can skip the explicit transaction."""
+        from duckel.runner import _is_single_statement
+
+        assert _is_single_statement("COPY t TO 'out.parquet' (FORMAT PARQUET);")
+        assert _is_single_statement("INSERT INTO tgt.public.t SELECT * FROM src")
+        assert not _is_single_statement("DROP TABLE IF EXISTS t; CREATE TABLE t AS SELECT 1;")
+
+    def test_stage_sql_is_reused_across_runs(self, sample_parquet_file, tmp_path):
+        """Test that repeated runs of a pipeline reuse the formatted read-stage queries."""
+        from duckel.runner import _stage_sql
+
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(tmp_path / "output.parquet")},
+        )
+        PipelineRunner(config).run()
+        hits = _stage_sql.cache_info().hits
+        PipelineRunner(config).run()
+
+        assert _stage_sql.cache_info().hits == hits + 1
+
+    def test_staged_source_is_read_once_and_dropped(
+        self, sample_parquet_file, tmp_path, monkeypatch
+    ):
+        """Test that staged sources feed every stage and the stage table is cleaned up."""
+        import duckel.runner
+
+        # Stage local Parquet the same way remote Postgres/Snowflake sources are staged
+        monkeypatch.setattr(duckel.runner, "_STAGED_SOURCE_TYPES", frozenset({"parquet"}))
+        output_path = tmp_path / "output.parquet"
+
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(output_path), "mode": "overwrite"},
+        )
+
+        result = PipelineRunner(config, {"compute_summary": True}).run()
+
+        assert result["rows"] == 5
+        assert duckel.runner.STAGE_TABLE in result["write_sql"]
+        assert len(pd.read_parquet(output_path)) == 5
+
+
+class TestPipelineRunnerAttachments:
+    """Test how source and target attachments are set up."""
+
+    def test_same_database_shares_attachment(self):
+        """Test that a target on the source's database reuses the source attachment."""
+        conn = "dbname=db host=localhost password=__ENV:DUCKEL_PG_PASSWORD"
+        config = PipelineConfig(
+            source={"type": "postgres", "conn": conn, "object": "public.src"},
+            target={"type": "postgres", "conn": conn, "name": "pg_tgt", "table": "public.dst"},
+        )
+
+        runner = PipelineRunner(config)
+
+        assert runner._shared_attachment
+        assert runner._target_dict["name"] == "pg_source_attachment"
+
+    def test_attached_targets_write_single_threaded(self):
+        """Test that writes into attached databases use one thread unless forced."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "postgres", "conn": "dbname=a", "table": "dst"},
+            options={"threads": 8},
+        )
+
+        assert PipelineRunner(config)._write_threads == 1
+        assert PipelineRunner(config, {"force_parallel_write": True})._write_threads == 8
+
+    def test_different_databases_attach_separately(self):
+        """Test that targets on another database keep their own attachment."""
+        config = PipelineConfig(
+            source={"type": "postgres", "conn": "dbname=a", "object": "public.src"},
+            target={"type": "postgres", "conn": "dbname=b", "name": "pg_tgt", "table": "dst"},
+        )
+
+        runner = PipelineRunner(config)
+
+        assert not runner._shared_attachment
+        assert runner._target_dict["name"] == "pg_tgt"
+
+    def test_shared_engine_keeps_remote_attachment(self):
+        """Test that a shared engine re-attaches only when the connection string changes."""
+        from duckel.engine import DuckDBEngine
+
+        attaches = []
+
+        class FakeSnowflakeSource:
+            def attachment_name(self):
+                return "sf_source_attachment"
+
+            def attach(self, con):
+                attaches.append(1)
+                con.execute("ATTACH ':memory:' AS sf_source_attachment")
+
+        def attach_once(engine, conn, fail=False):
+            config = PipelineConfig(
+                source={"type": "snowflake", "conn": conn, "object": "db.public.src"},
+                target={"type": "parquet", "path": "./output.parquet"},
+            )
+            runner = PipelineRunner(config, engine=engine)
+            with runner._connect(frozenset()) as con:
+                runner._attach(con, FakeSnowflakeSource(), runner._source_dict)
+                if fail:
+                    raise RuntimeError("write failed")
+
+        engine = DuckDBEngine(extensions=())
+        with engine as con:
+            attach_once(engine, "account=a")
+            attach_once(engine, "account=a")
+            assert len(attaches) == 1
+
+            attach_once(engine, "account=b")
+            assert len(attaches) == 2
+            assert list(engine.attachments) == ["sf_source_attachment"]
+
+            # A failed run drops the attachment instead of handing it to the next run
+            with pytest.raises(RuntimeError):
+                attach_once(engine, "account=b", fail=True)
+            assert engine.attachments == {}
+            assert "sf_source_attachment" not in PipelineRunner._attached_databases(con)
+
+    def test_schema_fingerprint(self, tmp_path, monkeypatch):
+        """Test that the schema fingerprint tracks source columns and is persisted."""
+        config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "postgres", "conn": "dbname=a", "table": "dst"},
+        )
+        runner = PipelineRunner(config, pipeline_name="fp")
+        monkeypatch.setattr(runner, "_get_state_path", lambda: tmp_path / "state.db")
+
+        with duckdb.connect() as con:
+            before = runner._schema_fingerprint(con, "(SELECT 1 AS id)")
+            assert before == runner._schema_fingerprint(con, "(SELECT 2 AS id)")
+            assert before != runner._schema_fingerprint(con, "(SELECT 1 AS id, 'x' AS name)")
+
+        assert runner._get_schema_fingerprint() is None
+        runner._save_schema_fingerprint(before)
+        assert runner._get_schema_fingerprint() == before
+
+        # File targets have no schema sync to skip
+        file_config = PipelineConfig(
+            source={"type": "parquet", "path": "./input.parquet"},
+            target={"type": "parquet", "path": "./output.parquet"},
+        )
+        assert PipelineRunner(file_config)._schema_fingerprint(None, "unused") is None
+
+    def test_skipped_schema_sync_reruns_when_write_fails(
+        self, sample_parquet_file, tmp_path, monkeypatch
+    ):
+        """Test that a write failing after an unchanged fingerprint re-syncs the target."""
+        import duckel.runner
+        from duckel.adapters import ParquetTargetAdapter
+
+        # Fingerprint a file target as if it were a database table
+        monkeypatch.setattr(duckel.runner, "_ATTACHED_TARGET_TYPES", frozenset({"parquet"}))
+        monkeypatch.setattr(PipelineRunner, "_get_state_path", lambda self: tmp_path / "state.db")
+        syncs = []
+        monkeypatch.setattr(
+            ParquetTargetAdapter, "sync_schema", lambda self, *args, **kwargs: syncs.append(1)
+        )
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={
+                "type": "parquet",
+                "path": str(tmp_path / "output.parquet"),
+                "table": "dst",
+            },
+        )
+
+        PipelineRunner(config, pipeline_name="fp").run()
+        PipelineRunner(config, pipeline_name="fp").run()
+        assert len(syncs) == 1
+
+        # The target changed outside duckel: the first write attempt fails
+        execute_write = PipelineRunner._execute_write
+        attempts = []
+
+        def flaky_write(self, con, write_sql):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise duckel.runner.PipelineExecutionError("Write operation failed")
+            return execute_write(self, con, write_sql)
+
+        monkeypatch.setattr(PipelineRunner, "_execute_write", flaky_write)
+        assert PipelineRunner(config, pipeline_name="fp").run()["rows"] == 5
+        assert len(syncs) == 2
+        assert len(attempts) == 2
+
 
 class TestPipelineRunnerErrors:
     """Test error handling in pipeline runner."""
@@ -147,11 +481,14 @@ class TestPipelineRunnerErrors:
         with pytest.raises(PipelineExecutionError):
             runner.run()
 
-    def test_invalid_output_path(self, sample_parquet_file):
+    def test_invalid_output_path(self, sample_parquet_file, tmp_path):
         """Test that invalid output path raises error."""
+        # A regular file as the parent directory fails on every platform, even as root
+        not_a_dir = tmp_path / "not_a_dir"
+        not_a_dir.touch()
         config = PipelineConfig(
             source={"type": "parquet", "path": str(sample_parquet_file)},
-            target={"type": "parquet", "path": "/invalid/path/output.parquet"},
+            target={"type": "parquet", "path": str(not_a_dir / "output.parquet")},
         )
 
         runner = PipelineRunner(config)
@@ -175,22 +512,44 @@ class TestPipelineRunnerErrors:
 class TestPipelineRunnerLegacyCompatibility:
     """Test backward compatibility with legacy run_pipeline function."""
 
-    def test_legacy_run_pipeline_function(self, sample_parquet_file, tmp_path):
-        """Test that legacy run_pipeline function still works."""
-        from duckel.runner import run_pipeline
-
-        output_path = tmp_path / "output.parquet"
+    def test_run_pipeline_validates_each_config_once(self, sample_parquet_file, tmp_path):
+        """Test that repeated run_pipeline calls reuse the validated config."""
+        from duckel.runner import _compile_pipeline
 
         pipeline_dict = {
             "source": {"type": "parquet", "path": str(sample_parquet_file)},
-            "target": {"type": "parquet", "path": str(output_path), "mode": "overwrite"},
+            "target": {"type": "parquet", "path": str(tmp_path / "out.parquet")},
         }
+        _compile_pipeline.cache_clear()
 
-        result = run_pipeline(pipeline_dict)
+        run_pipeline(pipeline_dict)
+        run_pipeline(dict(reversed(list(pipeline_dict.items()))), {"sample_data": False})
 
-        # Verify it works the same way
-        assert result["rows"] == 5
-        assert output_path.exists()
+        info = _compile_pipeline.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_run_pipeline_reuses_engine(self, sample_parquet_file, tmp_path, monkeypatch):
+        """Test that run_pipeline reuses one engine and detaches what each run attached."""
+        import duckel.runner
+        from duckel.adapters import ParquetSourceAdapter
+        from duckel.pool import EnginePool
+
+        pool = EnginePool()
+        monkeypatch.setattr(duckel.runner, "default_pool", pool)
+        monkeypatch.setattr(
+            ParquetSourceAdapter, "attach", lambda self, con: con.execute("ATTACH ':memory:' AS x")
+        )
+
+        pipeline_dict = {
+            "source": {"type": "parquet", "path": str(sample_parquet_file)},
+            "target": {"type": "parquet", "path": str(tmp_path / "out.parquet")},
+        }
+
+        # A leftover attachment would make the second ATTACH fail
+        assert run_pipeline(pipeline_dict)["rows"] == 5
+        assert run_pipeline(pipeline_dict)["rows"] == 5
+        assert [idle.qsize() for idle in pool._idle.values()] == [1]
+        pool.close()
 
 
 @pytest.mark.integration
@@ -199,12 +558,15 @@ class TestPipelineIntegration:
 
     def test_large_dataset(self, tmp_path):
         """Test pipeline with larger dataset."""
-        # Create larger dataset
-        df = pd.DataFrame({"id": range(1000), "value": range(1000, 2000)})
-
         input_path = tmp_path / "large_input.parquet"
         output_path = tmp_path / "large_output.parquet"
-        df.to_parquet(input_path, index=False)
+
+        # Create larger dataset directly with DuckDB's Parquet writer
+        with duckdb.connect() as con:
+            con.execute(
+                "COPY (SELECT i AS id, i + 1000 AS value FROM range(1000) t(i)) "
+                f"TO '{input_path}' (FORMAT parquet)"
+            )
 
         config = PipelineConfig(
             source={"type": "parquet", "path": str(input_path)},
@@ -217,21 +579,22 @@ class TestPipelineIntegration:
         assert result["rows"] == 1000
 
         # Verify output
-        output_df = pd.read_parquet(output_path)
-        assert len(output_df) == 1000
+        with duckdb.connect() as con:
+            count = con.execute(f"SELECT COUNT(*) FROM '{output_path}'").fetchone()[0]
+        assert count == 1000
 
-    def test_compression_options(self, sample_parquet_file, tmp_path):
+    @pytest.mark.parametrize("compression", ["zstd", "gzip", "snappy"])
+    def test_compression_options(self, sample_parquet_file, tmp_path, compression):
         """Test different compression options."""
-        for compression in ["zstd", "gzip", "snappy"]:
-            output_path = tmp_path / f"output_{compression}.parquet"
+        output_path = tmp_path / f"output_{compression}.parquet"
 
-            config = PipelineConfig(
-                source={"type": "parquet", "path": str(sample_parquet_file)},
-                target={"type": "parquet", "path": str(output_path), "compression": compression},
-            )
+        config = PipelineConfig(
+            source={"type": "parquet", "path": str(sample_parquet_file)},
+            target={"type": "parquet", "path": str(output_path), "compression": compression},
+        )
 
-            runner = PipelineRunner(config)
-            result = runner.run()
+        runner = PipelineRunner(config)
+        result = runner.run()
 
-            assert output_path.exists()
-            assert compression.lower() in result["write_sql"]
+        assert output_path.exists()
+        assert compression.lower() in result["write_sql"]
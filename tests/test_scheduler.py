@@ -0,0 +1,60 @@
+"""
+Unit tests for the pipeline scheduler.
+
+Tests trigger reuse and validation of schedule arguments.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from duckel.scheduler import SchedulerManager
+
+
+def _noop(config):
+    pass
+
+
+@pytest.fixture
+def manager():
+    """Running scheduler, shut down after the test."""
+    manager = SchedulerManager()
+    yield manager
+    manager.shutdown()
+
+
+class TestSchedulePipelineRun:
+    """Test how pipeline runs are scheduled."""
+
+    def test_same_cron_expression_shares_trigger(self, manager):
+        """Test that jobs on the same cron expression reuse one parsed trigger."""
+        first = manager.schedule_pipeline_run(_noop, {}, cron_expr="*/5 * * * *", job_id="a")
+        second = manager.schedule_pipeline_run(_noop, {}, cron_expr="*/5 * * * *", job_id="b")
+        other = manager.schedule_pipeline_run(_noop, {}, cron_expr="0 * * * *", job_id="c")
+
+        assert first.trigger is second.trigger
+        assert other.trigger is not first.trigger
+        assert {job.id for job in manager.get_jobs()} == {"a", "b", "c"}
+
+    def test_same_run_time_shares_trigger(self, manager):
+        """Test that one-off jobs at the same time reuse one trigger."""
+        run_at = datetime.now() + timedelta(hours=1)
+
+        first = manager.schedule_pipeline_run(_noop, {}, run_at=run_at, job_id="a")
+        second = manager.schedule_pipeline_run(_noop, {}, run_at=run_at, job_id="b")
+
+        assert first.trigger is second.trigger
+
+    def test_invalid_cron_expression_raises(self, manager):
+        """Test that a malformed cron string is still rejected."""
+        with pytest.raises(ValueError):
+            manager.schedule_pipeline_run(_noop, {}, cron_expr="not a cron", job_id="bad")
+        with pytest.raises(ValueError):
+            manager.schedule_pipeline_run(_noop, {}, cron_expr="99 * * * *", job_id="bad")
+
+        assert manager.get_jobs() == []
+
+    def test_missing_schedule_raises(self, manager):
+        """Test that a run needs either run_at or cron_expr."""
+        with pytest.raises(ValueError, match="Must provide either run_at or cron_expr"):
+            manager.schedule_pipeline_run(_noop, {}, job_id="none")
@@ -1,36 +1,60 @@
+import csv
+import glob
+import html
 import os
+import re
 import sys
+import threading
 import time
 import traceback
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import streamlit as st
+import streamlit.components.v1 as components
 
 # Add project root to path to find duckel package
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from datetime import datetime, timedelta
-
-import duckdb
-
 from duckel.adapters import create_source_adapter, create_target_adapter
 from duckel.config import load_config, save_pipeline_config
 from duckel.logger import logger
-from duckel.models import PipelineConfig
+from duckel.models import PipelineConfig, SourceConfig, TargetConfig
 from duckel.runner import PipelineRunner, run_pipeline
 from duckel.scheduler import SchedulerManager
 
-st.set_page_config(
-    page_title="DuckEL - Data Pipeline Orchestration",
-    page_icon="🦆",
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
-# Custom CSS for premium feel
-st.markdown(
-    """
+# Paths relative to the directory the app is launched from, built once per process
+PIPELINES_CONFIG = os.path.join("configs", "pipelines.yml")
+LOG_DIR = "logs"
+HISTORY_FILE = os.path.join(LOG_DIR, "history.csv")
+# Level field of duckel.logger's "%(asctime)s | %(levelname)-8s | ..." format
+_LOG_LEVEL_RE = re.compile(r"[^|]*\| (DEBUG|INFO|WARNING|ERROR|CRITICAL)\s*\|")
+# Logs larger than twice this are only read from the end
+_LOG_TAIL_BYTES = 1 << 20
+
+# Caps on what the Run tab sends to the browser after a run
+_PREVIEW_ROWS = 200
+_CHART_COLUMNS = 30
+
+# Log tab entry markup per level, as (prefix, suffix) around the escaped line
+_LOG_ENTRY_STYLE = "padding:0.5rem;margin:0.2rem 0;font-family:monospace;font-size:0.85rem;"
+_LEVEL_HTML = {
+    "ERROR": (f'<div class="error-box" style="{_LOG_ENTRY_STYLE}">❌ ', "</div>"),
+    "WARNING": (
+        f'<div style="{_LOG_ENTRY_STYLE}background:#fff3cd;border-left:3px solid #ffc107;">⚠️ ',
+        "</div>",
+    ),
+    "INFO": (f'<div class="info-box" style="{_LOG_ENTRY_STYLE}">ℹ️ ', "</div>"),
+    None: (
+        f'<div style="{_LOG_ENTRY_STYLE}background:#f8f9fa;border-left:3px solid #6c757d;">🔍 ',
+        "</div>",
+    ),
+}
+
+# Custom CSS for premium feel. Streamlit removes any element a rerun does not emit
+# again, so the styles are re-sent every run rather than once per session.
+_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
 
@@ -152,65 +176,170 @@ st.markdown(
         margin: 0;
     }
 </style>
-""",
-    unsafe_allow_html=True,
+"""
+
+# Start button and feature cards, shown on the landing page only
+_LANDING_CSS = """
+<style>
+    .stButton button[kind="primary"] {
+        padding: 0.75rem 2rem;
+        font-size: 1.1rem;
+        font-weight: 600;
+        background: linear-gradient(90deg, #4F46E5 0%, #7C3AED 100%);
+        border: none;
+        box-shadow: 0 4px 6px -1px rgba(79, 70, 229, 0.2);
+        transition: all 0.2s;
+    }
+    .stButton button[kind="primary"]:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 10px 15px -3px rgba(79, 70, 229, 0.3);
+    }
+    .feature-grid {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 1rem;
+        margin: 3rem 0 4rem 0;
+    }
+    .feature-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        border: 1px solid #E5E7EB;
+        height: 100%;
+        text-align: center;
+    }
+    .feature-icon {
+        font-size: 2rem;
+        margin-bottom: 1rem;
+        display: inline-block;
+        padding: 12px;
+        background: #EEF2FF;
+        border-radius: 12px;
+    }
+</style>
+"""
+
+
+# Landing page markup; the feature cards are one CSS grid rather than three columns
+_HERO_HTML = """
+<div style="text-align: center; padding: 4rem 0 3rem 0;">
+    <h1 style="text-align: center; font-size: 3.5rem; margin-bottom: 1rem; background: linear-gradient(90deg, #4F46E5 0%, #7C3AED 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">
+        Welcome to DuckEL
+    </h1>
+    <p style="text-align: center; font-size: 1.25rem; color: #6B7280; max-width: 600px; margin: 0 auto;">
+        The enterprise-grade orchestration engine for modern data teams.
+        Move data between Parquet, Postgres, and Snowflake with lightning speed.
+    </p>
+</div>
+"""
+
+_FEATURE_GRID_HTML = """
+<div class="feature-grid">
+    <div class="feature-card">
+        <div class="feature-icon" style="background: transparent;">
+            <img src="https://duckdb.org/images/logo-dl/DuckDB_Logo-stacked.svg" width="60" alt="DuckDB Logo">
+        </div>
+        <h3>Powered by DuckDB</h3>
+        <p style="color: #6B7280;">Leverage the world's fastest in-process SQL OLAP DBMS for lightning-fast transformations.</p>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">🔌</div>
+        <h3>Universal Connectors</h3>
+        <p style="color: #6B7280;">Seamlessly move data between local Parquet storage, PostgreSQL, and Snowflake warehouses.</p>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">🔁</div>
+        <h3>Incremental &amp; Evolving</h3>
+        <p style="color: #6B7280;">Watermark-based incremental loads with append or upsert, plus automatic schema evolution on the target.</p>
+    </div>
+</div>
+"""
+
+
+@st.cache_data(max_entries=4)
+def _read_history(path: str, mtime_ns: int, rows: int = 5, tail_bytes: int = 8192):
+    """
+    Read the last rows of the run history CSV without parsing the whole file.
+
+    Only the header and the final tail_bytes are read, so the cost is bounded by
+    the rows shown rather than the length of the history. The mtime argument
+    makes each file version a new cache entry.
+
+    Args:
+        path: History CSV path
+        mtime_ns: File modification time, used only as a cache key
+        rows: Number of most recent rows to return
+        tail_bytes: Bytes read from the end of the file
+
+    Returns:
+        DataFrame of the most recent rows, oldest first
+    """
+    import io
+
+    import pandas as pd
+
+    size = os.stat(path).st_size
+    with open(path, "rb") as f:
+        header = f.readline()
+        if size <= tail_bytes:
+            lines = f.read().splitlines()
+        else:
+            f.seek(size - tail_bytes)
+            # The first line of the chunk is usually cut mid-row
+            lines = f.read().splitlines()[1:]
+    body = b"\n".join(lines[-rows:])
+    return pd.read_csv(io.BytesIO(header + body))
+
+
+@st.cache_data(ttl=5, max_entries=4, show_spinner=False)
+def _read_log(path: str, mtime_ns: int, size: int, full: bool = False):
+    """
+    Parse the log file into one row per non-empty line with its level.
+
+    Each line is stripped and classified by the formatter's level field in one
+    compiled-regex pass; continuation lines such as tracebacks have no level.
+    Unless full is set, files over twice _LOG_TAIL_BYTES are read only from their
+    last _LOG_TAIL_BYTES. The mtime and size arguments make each file version a
+    new cache entry.
+
+    Args:
+        path: Log file path
+        mtime_ns: File modification time, used only as a cache key
+        size: File size, used only as a cache key
+        full: Read the whole file regardless of size
+
+    Returns:
+        DataFrame with "line" and "level" columns, oldest first
+    """
+    import pandas as pd
+
+    with open(path, "rb") as f:
+        if not full and size > 2 * _LOG_TAIL_BYTES:
+            f.seek(size - _LOG_TAIL_BYTES)
+            # The first line of the chunk is usually cut mid-line
+            raw = f.read().split(b"\n", 1)[-1]
+        else:
+            raw = f.read()
+    lines = [line for line in map(str.strip, raw.decode(errors="replace").splitlines()) if line]
+    levels = [m.group(1) if (m := _LOG_LEVEL_RE.match(line)) else None for line in lines]
+    return pd.DataFrame({"line": lines, "level": levels})
+
+
+st.set_page_config(
+    page_title="DuckEL - Data Pipeline Orchestration",
+    page_icon="🦆",
+    layout="wide",
+    initial_sidebar_state="expanded",
 )
 
+st.markdown(_CSS, unsafe_allow_html=True)
+
 # --- LANDING PAGE ---
 if "app_started" not in st.session_state:
-    # Custom Start Button Style
-    st.markdown(
-        """
-    <style>
-        .stButton button[kind="primary"] {
-            padding: 0.75rem 2rem;
-            font-size: 1.1rem;
-            font-weight: 600;
-            background: linear-gradient(90deg, #4F46E5 0%, #7C3AED 100%);
-            border: none;
-            box-shadow: 0 4px 6px -1px rgba(79, 70, 229, 0.2);
-            transition: all 0.2s;
-        }
-        .stButton button[kind="primary"]:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 15px -3px rgba(79, 70, 229, 0.3);
-        }
-        .feature-card {
-            background: white;
-            padding: 1.5rem;
-            border-radius: 12px;
-            border: 1px solid #E5E7EB;
-            height: 100%;
-            text-align: center;
-        }
-        .feature-icon {
-            font-size: 2rem;
-            margin-bottom: 1rem;
-            display: inline-block;
-            padding: 12px;
-            background: #EEF2FF;
-            border-radius: 12px;
-        }
-    </style>
-    """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(_LANDING_CSS, unsafe_allow_html=True)
 
     # Hero Section
-    st.markdown(
-        """
-    <div style="text-align: center; padding: 4rem 0 3rem 0;">
-        <h1 style="text-align: center; font-size: 3.5rem; margin-bottom: 1rem; background: linear-gradient(90deg, #4F46E5 0%, #7C3AED 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">
-            Welcome to DuckEL
-        </h1>
-        <p style="text-align: center; font-size: 1.25rem; color: #6B7280; max-width: 600px; margin: 0 auto;">
-            The enterprise-grade orchestration engine for modern data teams.
-            Move data between Parquet, Postgres, and Snowflake with lightning speed.
-        </p>
-    </div>
-    """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(_HERO_HTML, unsafe_allow_html=True)
 
     # Call to Action
     col1, col2, col3 = st.columns([1, 1, 1])
@@ -224,62 +353,17 @@ if "app_started" not in st.session_state:
             st.session_state["app_started"] = True
             st.rerun()
 
-    st.markdown("<div style='height: 3rem;'></div>", unsafe_allow_html=True)
-
     # Feature Grid
-    c1, c2, c3 = st.columns(3)
-
-    with c1:
-        st.markdown(
-            """
-        <div class="feature-card">
-            <div class="feature-icon" style="background: transparent;">
-                <img src="https://duckdb.org/images/logo-dl/DuckDB_Logo-stacked.svg" width="60" alt="DuckDB Logo">
-            </div>
-            <h3>Powered by DuckDB</h3>
-            <p style="color: #6B7280;">Leverage the world's fastest in-process SQL OLAP DBMS for lightning-fast transformations.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    with c2:
-        st.markdown(
-            """
-        <div class="feature-card">
-            <div class="feature-icon">🔌</div>
-            <h3>Universal Connectors</h3>
-            <p style="color: #6B7280;">Seamlessly move data between local Parquet storage, PostgreSQL, and Snowflake warehouses.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    with c3:
-        st.markdown(
-            """
-        <div class="feature-card">
-            <div class="feature-icon">🔁</div>
-            <h3>Incremental &amp; Evolving</h3>
-            <p style="color: #6B7280;">Watermark-based incremental loads with append or upsert, plus automatic schema evolution on the target.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    st.markdown("<div style='height: 4rem;'></div>", unsafe_allow_html=True)
+    st.markdown(_FEATURE_GRID_HTML, unsafe_allow_html=True)
 
     # Recent Activity
     st.subheader("🕑 Recent Activity")
     try:
-        import pandas as pd
-
-        hist_path = os.path.join("logs", "history.csv")
-        if os.path.exists(hist_path):
-            df = pd.read_csv(hist_path)
+        if os.path.exists(HISTORY_FILE):
+            df = _read_history(HISTORY_FILE, os.stat(HISTORY_FILE).st_mtime_ns)
             # Show last 5, newest first
             st.dataframe(
-                df.tail(5).iloc[::-1],
+                df.iloc[::-1],
                 use_container_width=True,
                 hide_index=True,
                 column_config={
@@ -318,6 +402,286 @@ def get_scheduler():
     return SchedulerManager()
 
 
+@st.cache_resource
+def _ensure_dir(path: str) -> str:
+    """Create a directory once per process; later reruns skip the filesystem check."""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _open_history():
+    """Open the run history CSV for appending, writing the header when the file is new."""
+    _ensure_dir(LOG_DIR)
+    f = open(HISTORY_FILE, "a", newline="", buffering=65536)
+    writer = csv.writer(f)
+    if f.tell() == 0:
+        writer.writerow(["timestamp", "pipeline", "rows", "duration_s", "status"])
+        f.flush()
+    return f, writer
+
+
+@st.cache_resource
+def _history_writer():
+    """
+    Open the run history CSV for appending once per process.
+
+    Sessions share the handle, so it is only used through _append_history.
+
+    Returns:
+        Mutable [file handle, csv writer] pair and the lock guarding it
+    """
+    return list(_open_history()), threading.Lock()
+
+
+def _append_history(row: list) -> None:
+    """
+    Append a row to the run history CSV and flush it so the landing page sees it.
+
+    The shared handle is reopened when history.csv was deleted or replaced (e.g.
+    rotated) since it was opened; otherwise rows would go to the unlinked file.
+
+    Args:
+        row: Values for the timestamp, pipeline, rows, duration_s and status columns
+    """
+    handle, lock = _history_writer()
+    with lock:
+        f, writer = handle
+        try:
+            on_disk = os.stat(HISTORY_FILE)
+        except FileNotFoundError:
+            on_disk = None
+        opened = os.fstat(f.fileno())
+        if on_disk is None or (on_disk.st_dev, on_disk.st_ino) != (opened.st_dev, opened.st_ino):
+            f.close()
+            handle[:] = _open_history()
+            f, writer = handle
+        writer.writerow(row)
+        f.flush()
+
+
+@st.cache_resource
+def _get_duck():
+    """
+    One in-memory DuckDB shared by the sidebar's connection checks.
+
+    Returns:
+        Connection, the attachments made on it (alias -> conn string), and a lock
+        guarding both across Streamlit sessions
+    """
+    import duckdb
+
+    return duckdb.connect(), {}, threading.Lock()
+
+
+def _get_attached(cfg: dict, role: str):
+    """
+    Attach a Postgres/Snowflake config to the shared connection unless it already is.
+
+    Args:
+        cfg: Source or target config built by the sidebar
+        role: "src" or "tgt"
+
+    Returns:
+        Cursor on the shared connection with the attachment available, and the adapter
+    """
+    con, attached, lock = _get_duck()
+    factory = create_source_adapter if role == "src" else create_target_adapter
+    adapter = factory(cfg)
+    name = adapter.attachment_name()
+    with lock:
+        if attached.get(name) != cfg["conn"]:
+            if name in attached:
+                con.execute(f"DETACH DATABASE IF EXISTS {name}")
+                del attached[name]
+            adapter.attach(con)
+            attached[name] = cfg["conn"]
+    return con.cursor(), adapter
+
+
+# Table listing per database kind, formatted with the attachment name. Postgres is
+# asked directly for its catalog rather than through DuckDB's information_schema
+# view, which has to load every schema of the attached database first.
+_TABLE_LIST_SQL = {
+    "postgres": (
+        "SELECT * FROM postgres_query('{name}', '"
+        "SELECT schemaname || ''.'' || tablename FROM pg_catalog.pg_tables "
+        "WHERE schemaname NOT IN (''pg_catalog'', ''information_schema'') "
+        "UNION ALL "
+        "SELECT schemaname || ''.'' || viewname FROM pg_catalog.pg_views "
+        "WHERE schemaname NOT IN (''pg_catalog'', ''information_schema'') "
+        "ORDER BY 1')"
+    ),
+    "snowflake": (
+        "SELECT table_schema || '.' || table_name FROM {name}.information_schema.tables "
+        "WHERE table_schema != 'INFORMATION_SCHEMA' ORDER BY 1"
+    ),
+}
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_tables(role: str, kind: str, name: str, conn: str) -> tuple[str, ...]:
+    """
+    List the tables of an attached database, cached for five minutes per connection.
+
+    Args:
+        role: "src" or "tgt"
+        kind: "postgres" or "snowflake"
+        name: Attachment name
+        conn: Connection string (part of the cache key only through its hash)
+
+    Returns:
+        Sorted "schema.table" names
+    """
+    t_con, _ = _get_attached({"type": kind, "name": name, "conn": conn}, role)
+    q = _TABLE_LIST_SQL[kind].format(name=name)
+    return tuple(t_con.execute(q).fetch_arrow_table().column(0).to_pylist())
+
+
+# role -> (config field, text label, selectbox label, default table, text input key)
+_ROLE_TABLE_WIDGET = {
+    "src": ("object", "Table/View", "Select Table/View", "my_table", "src_obj"),
+    "tgt": ("table", "Target Table", "Target Table", "my_output_table", "tgt_table"),
+}
+
+
+def _render_conn_block(role: str, kind: str, cfg: dict):
+    """
+    Render the connection widgets for a Postgres/Snowflake source or target.
+
+    Fills in cfg's attachment name, connection string, and object (source) or
+    table (target). Widget keys are namespaced by role and kind; fetched table
+    lists are kept in st.session_state["catalogs"] under (role, kind).
+
+    Args:
+        role: "src" or "tgt"
+        kind: "postgres" or "snowflake"
+        cfg: Source or target config being built by the sidebar
+    """
+    short = "pg" if kind == "postgres" else "sf"
+    prefix = f"{role}_{short}"
+    cfg["name"] = st.text_input(
+        "Attachment Name",
+        value=f"{short}_{'source' if role == 'src' else 'target'}_attachment",
+        key=f"{role}_name",
+    )
+
+    with st.expander("🔐 Connection Details", expanded=True):
+        # Typing in a form does not rerun the script; values apply on submit
+        with st.form(f"{prefix}_form", border=False):
+            c1, c2 = st.columns(2)
+            if kind == "postgres":
+                with c1:
+                    pg_host = st.text_input("Host", value="127.0.0.1", key=f"{prefix}_host")
+                    pg_user = st.text_input("User", value="myuser", key=f"{prefix}_user")
+                    pg_db = st.text_input("Database", value="mydb", key=f"{prefix}_db")
+                with c2:
+                    pg_port = st.text_input("Port", value="5432", key=f"{prefix}_port")
+                    pg_pass = st.text_input(
+                        "Password",
+                        value="__ENV:DUCKEL_PG_PASSWORD",
+                        type="password",
+                        key=f"{prefix}_pass",
+                    )
+                # Construct connection string internally
+                cfg["conn"] = (
+                    f"dbname={pg_db} user={pg_user} host={pg_host} port={pg_port} password={pg_pass}"
+                )
+            else:
+                with c1:
+                    sf_account = st.text_input(
+                        "Account", value="__ENV:DUCKEL_SF_ACCOUNT", key=f"{prefix}_acc"
+                    )
+                    sf_user = st.text_input(
+                        "User", value="__ENV:DUCKEL_SF_USER", key=f"{prefix}_user"
+                    )
+                    sf_warehouse = st.text_input(
+                        "Warehouse", value="__ENV:DUCKEL_SF_WAREHOUSE", key=f"{prefix}_wh"
+                    )
+                with c2:
+                    sf_database = st.text_input(
+                        "Database", value="__ENV:DUCKEL_SF_DATABASE", key=f"{prefix}_db"
+                    )
+                    sf_schema = st.text_input(
+                        "Schema", value="__ENV:DUCKEL_SF_SCHEMA", key=f"{prefix}_sch"
+                    )
+                    sf_pass = st.text_input(
+                        "Password",
+                        value="__ENV:DUCKEL_SF_PASSWORD",
+                        type="password",
+                        key=f"{prefix}_pass",
+                    )
+                cfg["conn"] = (
+                    f"user={sf_user} password={sf_pass} account={sf_account} warehouse={sf_warehouse} database={sf_database} schema={sf_schema}"
+                )
+            st.form_submit_button("Apply", use_container_width=True)
+
+    c_test, c_disc = st.columns([1, 1])
+    with c_test:
+        if st.button("🔌 Test Connection", key=f"test_{prefix}", use_container_width=True):
+            try:
+                with st.spinner("Testing connection..."):
+                    # A reused attachment is not re-verified by attaching, so round-trip
+                    t_con, adapter = _get_attached(cfg, role)
+                    adapter.ping(t_con)
+                    st.success("✅ Connection Successful!")
+            except Exception as e:
+                st.error(f"❌ Connection Failed: {e}")
+
+    with c_disc:
+        if st.button(
+            "🔍 Fetch Tables", key=f"fetch_{prefix}", type="primary", use_container_width=True
+        ):
+            try:
+                with st.spinner("Fetching tables..."):
+                    tables = _fetch_tables(role, kind, cfg["name"], cfg["conn"])
+                    st.session_state.setdefault("catalogs", {})[(role, kind)] = tables
+                    st.success(f"Found {len(tables)} tables")
+            except Exception as e:
+                st.error(f"Fetch failed: {e}")
+
+    field, label, pick_label, default, text_key = _ROLE_TABLE_WIDGET[role]
+    schema = "public" if kind == "postgres" else "PUBLIC"
+    tables = st.session_state.get("catalogs", {}).get((role, kind))
+    if tables:
+        cfg[field] = st.selectbox(pick_label, options=tables, key=f"{prefix}_sel")
+    else:
+        cfg[field] = st.text_input(label, value=f"{schema}.{default}", key=text_key)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _watermark(pipeline_name: str, incremental_key: str, _config: PipelineConfig):
+    """
+    Read a pipeline's stored watermark, cached briefly across reruns.
+
+    Args:
+        pipeline_name: Pipeline whose state is read
+        incremental_key: Part of the cache key so a changed key is re-read
+        _config: Pipeline config (not hashed; the name and key identify it)
+
+    Returns:
+        Last processed watermark, or None
+    """
+    return PipelineRunner(_config, pipeline_name=pipeline_name)._get_watermark()
+
+
+def _endpoint_label(endpoint) -> str:
+    """
+    Build the lineage diagram label for a source or target config.
+
+    Args:
+        endpoint: SourceConfig or TargetConfig
+
+    Returns:
+        Type and object/table/file name, separated by a mermaid line break
+    """
+    detail = getattr(endpoint, "object", None) or getattr(endpoint, "table", None)
+    if not detail:
+        path = getattr(endpoint, "path", None)
+        # Directory paths have no basename
+        detail = (os.path.basename(path) if path else None) or "FILE"
+    return f"{endpoint.type.upper()}\\n{detail}"
+
+
 scheduler = get_scheduler()
 
 # Sidebar
@@ -334,7 +698,7 @@ with st.sidebar:
     if config_mode == "📋 Preset Pipeline":
         # Traditional pipeline selection
         try:
-            pipelines = load_config(os.path.join("configs", "pipelines.yml"))
+            pipelines = load_config(PIPELINES_CONFIG)
         except Exception as e:
             st.error(f"❌ Failed to load configuration: {e}")
             st.stop()
@@ -365,140 +729,8 @@ with st.sidebar:
             )
             source_config["path"] = source_path
 
-        elif source_type == "postgres":
-            source_config["name"] = st.text_input(
-                "Attachment Name", value="pg_source_attachment", key="src_name"
-            )
-
-            with st.expander("🔐 Connection Details", expanded=True):
-                c1, c2 = st.columns(2)
-                with c1:
-                    pg_host = st.text_input("Host", value="127.0.0.1", key="src_pg_host")
-                    pg_user = st.text_input("User", value="myuser", key="src_pg_user")
-                    pg_db = st.text_input("Database", value="mydb", key="src_pg_db")
-                with c2:
-                    pg_port = st.text_input("Port", value="5432", key="src_pg_port")
-                    pg_pass = st.text_input(
-                        "Password",
-                        value="__ENV:DUCKEL_PG_PASSWORD",
-                        type="password",
-                        key="src_pg_pass",
-                    )
-
-            # Construct connection string internally
-            source_config["conn"] = (
-                f"dbname={pg_db} user={pg_user} host={pg_host} port={pg_port} password={pg_pass}"
-            )
-
-            c_test, c_disc = st.columns([1, 1])
-            with c_test:
-                if st.button("🔌 Test Connection", key="test_src_pg", use_container_width=True):
-                    try:
-                        with st.spinner("Testing connection..."):
-                            t_con = duckdb.connect()
-                            adapter = create_source_adapter(source_config)
-                            adapter.attach(t_con)
-                            st.success("✅ Connection Successful!")
-                    except Exception as e:
-                        st.error(f"❌ Connection Failed: {e}")
-
-            with c_disc:
-                if st.button(
-                    "🔍 Fetch Tables", key="fetch_src_pg", type="primary", use_container_width=True
-                ):
-                    try:
-                        with st.spinner("Fetching tables..."):
-                            t_con = duckdb.connect()
-                            adapter = create_source_adapter(source_config)
-                            adapter.attach(t_con)
-                            # Fetch tables
-                            q = f"SELECT table_schema || '.' || table_name FROM {source_config['name']}.information_schema.tables WHERE table_schema NOT IN ('information_schema', 'pg_catalog')"
-                            res = t_con.execute(q).fetchall()
-                            st.session_state["src_pg_tables"] = sorted([r[0] for r in res])
-                            st.success(f"Found {len(res)} tables")
-                    except Exception as e:
-                        st.error(f"Fetch failed: {e}")
-
-            if st.session_state.get("src_pg_tables"):
-                source_config["object"] = st.selectbox(
-                    "Select Table/View",
-                    options=st.session_state["src_pg_tables"],
-                    key="src_obj_sel",
-                )
-            else:
-                source_config["object"] = st.text_input(
-                    "Table/View", value="public.my_table", key="src_obj"
-                )
-
-        elif source_type == "snowflake":
-            source_config["name"] = st.text_input(
-                "Attachment Name", value="sf_source_attachment", key="src_name"
-            )
-
-            with st.expander("🔐 Connection Details", expanded=True):
-                c1, c2 = st.columns(2)
-                with c1:
-                    sf_account = st.text_input(
-                        "Account", value="__ENV:DUCKEL_SF_ACCOUNT", key="src_sf_acc"
-                    )
-                    sf_user = st.text_input("User", value="__ENV:DUCKEL_SF_USER", key="src_sf_user")
-                    sf_warehouse = st.text_input(
-                        "Warehouse", value="__ENV:DUCKEL_SF_WAREHOUSE", key="src_sf_wh"
-                    )
-                with c2:
-                    sf_database = st.text_input(
-                        "Database", value="__ENV:DUCKEL_SF_DATABASE", key="src_sf_db"
-                    )
-                    sf_schema = st.text_input(
-                        "Schema", value="__ENV:DUCKEL_SF_SCHEMA", key="src_sf_sch"
-                    )
-                    sf_pass = st.text_input(
-                        "Password",
-                        value="__ENV:DUCKEL_SF_PASSWORD",
-                        type="password",
-                        key="src_sf_pass",
-                    )
-
-            source_config["conn"] = (
-                f"user={sf_user} password={sf_pass} account={sf_account} warehouse={sf_warehouse} database={sf_database} schema={sf_schema}"
-            )
-
-            c_test, c_disc = st.columns([1, 1])
-            with c_test:
-                if st.button("🔌 Test Connection", key="test_src_sf", use_container_width=True):
-                    try:
-                        with st.spinner("Testing connection..."):
-                            t_con = duckdb.connect()
-                            adapter = create_source_adapter(source_config)
-                            adapter.attach(t_con)
-                            st.success("✅ Connection Successful!")
-                    except Exception as e:
-                        st.error(f"❌ Connection Failed: {e}")
-
-            with c_disc:
-                if st.button(
-                    "🔍 Fetch Tables", key="fetch_src_sf", type="primary", use_container_width=True
-                ):
-                    try:
-                        with st.spinner("Fetching tables..."):
-                            t_con = duckdb.connect()
-                            adapter = create_source_adapter(source_config)
-                            adapter.attach(t_con)
-                            q = f"SELECT table_schema || '.' || table_name FROM {source_config['name']}.information_schema.tables WHERE table_schema != 'INFORMATION_SCHEMA'"
-                            res = t_con.execute(q).fetchall()
-                            st.session_state["src_sf_tables"] = sorted([r[0] for r in res])
-                            st.success(f"Found {len(res)} tables")
-                    except Exception as e:
-                        st.error(f"Fetch failed: {e}")
-
-            if st.session_state.get("src_sf_tables"):
-                source_config["object"] = st.selectbox(
-                    "Select Table/View", options=st.session_state["src_sf_tables"], key="src_sf_sel"
-                )
-            else:
-                source_config["object"] = st.text_input(
-                    "Table/View", value="PUBLIC.my_table", key="src_obj"
-                )
+        elif source_type in ("postgres", "snowflake"):
+            _render_conn_block("src", source_type, source_config)
 
         # Incremental key (optional)
         with st.expander("⏱️ Incremental Options"):
@@ -529,136 +761,8 @@ with st.sidebar:
                 "Compression", ["zstd", "snappy", "gzip", "none"], key="tgt_comp"
             )
 
-        elif target_type == "postgres":
-            target_config["name"] = st.text_input(
-                "Attachment Name", value="pg_target_attachment", key="tgt_name"
-            )
-
-            with st.expander("🔐 Connection Details", expanded=True):
-                c1, c2 = st.columns(2)
-                with c1:
-                    pg_host = st.text_input("Host", value="127.0.0.1", key="tgt_pg_host")
-                    pg_user = st.text_input("User", value="myuser", key="tgt_pg_user")
-                    pg_db = st.text_input("Database", value="mydb", key="tgt_pg_db")
-                with c2:
-                    pg_port = st.text_input("Port", value="5432", key="tgt_pg_port")
-                    pg_pass = st.text_input(
-                        "Password",
-                        value="__ENV:DUCKEL_PG_PASSWORD",
-                        type="password",
-                        key="tgt_pg_pass",
-                    )
-
-            target_config["conn"] = (
-                f"dbname={pg_db} user={pg_user} host={pg_host} port={pg_port} password={pg_pass}"
-            )
-
-            c_test, c_disc = st.columns([1, 1])
-            with c_test:
-                if st.button("🔌 Test Connection", key="test_tgt_pg", use_container_width=True):
-                    try:
-                        with st.spinner("Testing connection..."):
-                            t_con = duckdb.connect()
-                            adapter = create_target_adapter(target_config)
-                            adapter.attach(t_con)
-                            st.success("✅ Connection Successful!")
-                    except Exception as e:
-                        st.error(f"❌ Connection Failed: {e}")
-
-            with c_disc:
-                if st.button(
-                    "🔍 Fetch Tables", key="fetch_tgt_pg", type="primary", use_container_width=True
-                ):
-                    try:
-                        with st.spinner("Fetching tables..."):
-                            t_con = duckdb.connect()
-                            adapter = create_target_adapter(target_config)
-                            adapter.attach(t_con)
-                            q = f"SELECT table_schema || '.' || table_name FROM {target_config['name']}.information_schema.tables WHERE table_schema NOT IN ('information_schema', 'pg_catalog')"
-                            res = t_con.execute(q).fetchall()
-                            st.session_state["tgt_pg_tables"] = sorted([r[0] for r in res])
-                            st.success(f"Found {len(res)} tables")
-                    except Exception as e:
-                        st.error(f"Fetch failed: {e}")
-
-            if st.session_state.get("tgt_pg_tables"):
-                target_config["table"] = st.selectbox(
-                    "Target Table", options=st.session_state["tgt_pg_tables"], key="tgt_pg_sel"
-                )
-            else:
-                target_config["table"] = st.text_input(
-                    "Target Table", value="public.my_output_table", key="tgt_table"
-                )
-
-        elif target_type == "snowflake":
-            target_config["name"] = st.text_input(
-                "Attachment Name", value="sf_target_attachment", key="tgt_name"
-            )
-
-            with st.expander("🔐 Connection Details", expanded=True):
-                c1, c2 = st.columns(2)
-                with c1:
-                    sf_account = st.text_input(
-                        "Account", value="__ENV:DUCKEL_SF_ACCOUNT", key="tgt_sf_acc"
-                    )
-                    sf_user = st.text_input("User", value="__ENV:DUCKEL_SF_USER", key="tgt_sf_user")
-                    sf_warehouse = st.text_input(
-                        "Warehouse", value="__ENV:DUCKEL_SF_WAREHOUSE", key="tgt_sf_wh"
-                    )
-                with c2:
-                    sf_database = st.text_input(
-                        "Database", value="__ENV:DUCKEL_SF_DATABASE", key="tgt_sf_db"
-                    )
-                    sf_schema = st.text_input(
-                        "Schema", value="__ENV:DUCKEL_SF_SCHEMA", key="tgt_sf_sch"
-                    )
-                    sf_pass = st.text_input(
-                        "Password",
-                        value="__ENV:DUCKEL_SF_PASSWORD",
-                        type="password",
-                        key="tgt_sf_pass",
-                    )
-
-            target_config["conn"] = (
-                f"user={sf_user} password={sf_pass} account={sf_account} warehouse={sf_warehouse} database={sf_database} schema={sf_schema}"
-            )
-
-            c_test, c_disc = st.columns([1, 1])
-            with c_test:
-                if st.button("🔌 Test Connection", key="test_tgt_sf", use_container_width=True):
-                    try:
-                        with st.spinner("Testing connection..."):
-                            t_con = duckdb.connect()
-                            adapter = create_target_adapter(target_config)
-                            adapter.attach(t_con)
-                            st.success("✅ Connection Successful!")
-                    except Exception as e:
-                        st.error(f"❌ Connection Failed: {e}")
-
-            with c_disc:
-                if st.button(
-                    "🔍 Fetch Tables", key="fetch_tgt_sf", type="primary", use_container_width=True
-                ):
-                    try:
-                        with st.spinner("Fetching tables..."):
-                            t_con = duckdb.connect()
-                            adapter = create_target_adapter(target_config)
-                            adapter.attach(t_con)
-                            q = f"SELECT table_schema || '.' || table_name FROM {target_config['name']}.information_schema.tables WHERE table_schema != 'INFORMATION_SCHEMA'"
-                            res = t_con.execute(q).fetchall()
-                            st.session_state["tgt_sf_tables"] = sorted([r[0] for r in res])
-                            st.success(f"Found {len(res)} tables")
-                    except Exception as e:
-                        st.error(f"Fetch failed: {e}")
-
-            if st.session_state.get("tgt_sf_tables"):
-                target_config["table"] = st.selectbox(
-                    "Target Table", options=st.session_state["tgt_sf_tables"], key="tgt_sf_sel"
-                )
-            else:
-                target_config["table"] = st.text_input(
-                    "Target Table", value="PUBLIC.my_output_table", key="tgt_table"
-                )
+        elif target_type in ("postgres", "snowflake"):
+            _render_conn_block("tgt", target_type, target_config)
 
         # Common target options
         target_config["mode"] = st.selectbox(
@@ -671,8 +775,6 @@ with st.sidebar:
             )
 
         # Build pipeline config dynamically
-        from duckel.models import PipelineConfig, SourceConfig, TargetConfig
-
         try:
             pipeline_config = PipelineConfig(
                 source=SourceConfig(**source_config), target=TargetConfig(**target_config)
@@ -686,9 +788,7 @@ with st.sidebar:
                 )
                 if st.button("Save to pipelines.yml", key="btn_save_preset"):
                     try:
-                        save_pipeline_config(
-                            os.path.join("configs", "pipelines.yml"), preset_name, pipeline_config
-                        )
+                        save_pipeline_config(PIPELINES_CONFIG, preset_name, pipeline_config)
                         st.success(f"✅ Saved as '{preset_name}'!")
                         st.info("💡 Restart app to see new preset.")
                     except Exception as e:
@@ -707,15 +807,22 @@ with st.sidebar:
     full_refresh = False
     if is_incremental:
         st.info(f"Incremental Key: `{pipeline_config.source.incremental_key}`")
-        try:
-            temp_runner = PipelineRunner(pipeline_config, pipeline_name=pipeline_name)
-            watermark = temp_runner._get_watermark()
-            if watermark:
-                st.write(f"Current Watermark: **{watermark}**")
+        c_wm, c_refresh = st.columns([4, 1])
+        with c_refresh:
+            if st.button("↻", key="refresh_watermark", help="Re-read the stored watermark"):
+                _watermark.clear()
+        with c_wm:
+            try:
+                watermark = _watermark(
+                    pipeline_name, pipeline_config.source.incremental_key, pipeline_config
+                )
+            except Exception as e:
+                st.warning(f"Could not read watermark: {e}")
             else:
-                st.write("Current Watermark: *None*")
-        except Exception:
-            pass
+                if watermark:
+                    st.write(f"Current Watermark: **{watermark}**")
+                else:
+                    st.write("Current Watermark: *None*")
         full_refresh = st.checkbox("Full Refresh", value=False)
 
     schema_evolution = st.selectbox(
@@ -728,7 +835,11 @@ with st.sidebar:
     st.subheader("Runtime Stages")
     compute_counts = st.checkbox("Compute Row Counts", value=True)
     sample_data = st.checkbox("Sample Data Preview", value=True)
-    compute_summary = st.checkbox("Generate Summary Stats", value=False)
+    compute_summary = st.checkbox(
+        "Generate Summary Stats",
+        value=False,
+        help="Computed over the sampled rows when sampling is enabled.",
+    )
 
     with st.expander("⚡ Advanced Settings"):
         threads = st.number_input("Threads", min_value=1, max_value=64, value=4)
@@ -741,26 +852,8 @@ with tab_run:
     # Visual Lineage
     st.subheader("🔗 Pipeline Flow")
 
-    import os
-
-    src_info = f"{pipeline_config.source.type.upper()}"
-    if hasattr(pipeline_config.source, "object") and pipeline_config.source.object:
-        src_info += f"\\n{pipeline_config.source.object}"
-    elif hasattr(pipeline_config.source, "path") and pipeline_config.source.path:
-        # Show filename if available, else FILE
-        name = os.path.basename(pipeline_config.source.path)
-        src_info += f"\\n{name if name else 'FILE'}"
-    else:
-        src_info += "\\nFILE"
-
-    tgt_info = f"{pipeline_config.target.type.upper()}"
-    if hasattr(pipeline_config.target, "table") and pipeline_config.target.table:
-        tgt_info += f"\\n{pipeline_config.target.table}"
-    elif hasattr(pipeline_config.target, "path") and pipeline_config.target.path:
-        name = os.path.basename(pipeline_config.target.path)
-        tgt_info += f"\\n{name if name else 'FILE'}"
-    else:
-        tgt_info += "\\nFILE"
+    src_info = _endpoint_label(pipeline_config.source)
+    tgt_info = _endpoint_label(pipeline_config.target)
 
     mermaid_graph = f"""
     graph LR
@@ -771,18 +864,20 @@ with tab_run:
         style T fill:#ECFDF5,stroke:#10B981,stroke-width:2px,color:#064E3B
     """
 
-    # Render using html component since st.markdown doesn't support mermaid locally
-    import streamlit.components.v1 as components
-
+    # Render using html component since st.markdown doesn't support mermaid locally.
+    # This is emitted every rerun on purpose: skipping it would remove the diagram, and
+    # the frontend keeps the existing iframe as long as the HTML is unchanged.
     components.html(
         f"""
+        <div class="mermaid" id="flow">
+            {mermaid_graph}
+        </div>
         <script type="module">
             import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';
-            mermaid.initialize({{ startOnLoad: true }});
+            // Render the one diagram directly instead of scanning the page on load
+            mermaid.initialize({{ startOnLoad: false }});
+            await mermaid.run({{ nodes: [document.getElementById("flow")] }});
         </script>
-        <div class="mermaid">
-            {mermaid_graph}
-        </div>
         """,
         height=200,
     )
@@ -790,8 +885,9 @@ with tab_run:
     # Display config snippet
     with st.expander("📋 Pipeline Blueprint", expanded=False):
         c1, c2 = st.columns(2)
-        c1.json(pipeline_config.source.model_dump())
-        c2.json(pipeline_config.target.model_dump())
+        # st.json sends a JSON string through as is, skipping the dict + json.dumps pass
+        c1.json(pipeline_config.source.model_dump_json())
+        c2.json(pipeline_config.target.model_dump_json())
 
     if st.button("🚀 Run Pipeline", type="primary", use_container_width=True):
         overrides = {
@@ -808,18 +904,26 @@ with tab_run:
 
             # Smart Progress Callback
             class SmartProgress:
-                def __init__(self, placeholder, threshold_s=10):
+                def __init__(self, placeholder, threshold_s=10, min_interval_s=0.1):
                     self.placeholder = placeholder
                     self.threshold_s = threshold_s
+                    self.min_interval_s = min_interval_s
                     self.start_time = time.time()
                     self.shown = False
+                    self.last_flush = 0.0
+                    self.last_pct = -1
 
                 def update(self, percent, message):
-                    elapsed = time.time() - self.start_time
-                    if elapsed > self.threshold_s:
+                    now = time.time()
+                    if now - self.start_time > self.threshold_s:
                         if not self.shown:
                             self.shown = True
-                        self.placeholder.progress(percent, text=message)
+                        # Each call is a delta to the browser: only send when the bar
+                        # moves or the interval has passed, always with the latest text
+                        if percent != self.last_pct or now - self.last_flush >= self.min_interval_s:
+                            self.placeholder.progress(percent, text=message)
+                            self.last_flush = now
+                            self.last_pct = percent
 
             prog_bg = st.empty()
             smart_prog = SmartProgress(prog_bg, threshold_s=10.0)
@@ -836,6 +940,8 @@ with tab_run:
 
             # Execute
             result = runner.run()
+            # The run may have advanced the watermark shown in the sidebar
+            _watermark.clear()
 
             # Always show completion
             prog_bg.progress(100, text="✅ Done!")
@@ -856,57 +962,52 @@ with tab_run:
 
             # Log history
             try:
-                import csv
-                from datetime import datetime
-
-                hist_dir = "logs"
-                if not os.path.exists(hist_dir):
-                    os.makedirs(hist_dir)
-                hist_file = os.path.join(hist_dir, "history.csv")
-                file_exists = os.path.exists(hist_file)
-                with open(hist_file, "a", newline="") as f:
-                    writer = csv.writer(f)
-                    if not file_exists:
-                        writer.writerow(["timestamp", "pipeline", "rows", "duration_s", "status"])
-                    writer.writerow(
-                        [
-                            datetime.now().isoformat(),
-                            pipeline_name,
-                            result["rows"],
-                            result["timings"]["total_s"],
-                            "SUCCESS",
-                        ]
-                    )
+                _append_history(
+                    [
+                        datetime.now().isoformat(),
+                        pipeline_name,
+                        result["rows"],
+                        result["timings"]["total_s"],
+                        "SUCCESS",
+                    ]
+                )
             except Exception as e:
                 logger.error(f"Failed to log history: {e}")
 
             # Metrics
-            cols = st.columns(5)
-            metrics_map = {
-                "rows": ("Rows", result["rows"]),
-                "total_s": ("Total Time", f"{result['timings']['total_s']}s"),
-                "write_s": ("Write Time", f"{result['timings']['write_s']}s"),
-                "count_s": ("Count Time", f"{result['timings']['count_s']}s"),
-                "summary_s": ("Summary Time", f"{result['timings']['summary_s']}s"),
-            }
-
-            for k, (label, val) in metrics_map.items():
-                with cols[list(metrics_map.keys()).index(k)]:
-                    st.metric(label, val)
+            timings = result["timings"]
+            metrics = (
+                ("Rows", result["rows"]),
+                ("Total Time", f"{timings['total_s']}s"),
+                ("Write Time", f"{timings['write_s']}s"),
+                ("Count Time", f"{timings['count_s']}s"),
+                ("Summary Time", f"{timings['summary_s']}s"),
+            )
+            for col, (label, val) in zip(st.columns(len(metrics)), metrics):
+                col.metric(label, val)
 
             if result.get("sample") is not None:
                 st.subheader("🔍 Data Preview")
-                st.dataframe(result["sample"], use_container_width=True)
+                sample_tbl = result["sample"]
+                if sample_tbl.num_rows > _PREVIEW_ROWS:
+                    st.caption(f"First {_PREVIEW_ROWS} of {sample_tbl.num_rows} sampled rows")
+                # Arrow slices are zero-copy; only the shown rows are serialized
+                st.dataframe(sample_tbl.slice(0, _PREVIEW_ROWS), use_container_width=True)
 
             if result.get("summary") is not None:
                 st.subheader("📊 Summary Statistics")
-                summary_df = result["summary"]
-                st.dataframe(summary_df, use_container_width=True)
+                summary_tbl = result["summary"]
+                st.dataframe(summary_tbl, use_container_width=True)
 
                 # visualiza distinct counts if available
-                if "approx_unique" in summary_df.columns:
-                    st.caption("Approximate Unique Values per Column")
-                    st.bar_chart(summary_df.set_index("column_name")["approx_unique"])
+                if "approx_unique" in summary_tbl.column_names:
+                    st.caption(f"Approximate Unique Values per Column (top {_CHART_COLUMNS})")
+                    chart_df = (
+                        summary_tbl.select(["column_name", "approx_unique"])
+                        .to_pandas()
+                        .nlargest(_CHART_COLUMNS, "approx_unique")
+                    )
+                    st.bar_chart(chart_df.set_index("column_name")["approx_unique"])
 
             with st.expander("📝 SQL Audit"):
                 st.code(result["write_sql"], language="sql")
@@ -981,13 +1082,35 @@ with tab_sched:
     if not jobs:
         st.write("No active jobs.")
     else:
-        for job in jobs:
-            c1, c2, c3 = st.columns([2, 2, 1])
-            c1.write(f"**ID:** {job.id}")
-            c2.write(f"**Next Run:** {job.next_run_time}")
-            if c3.button("🗑️", key=f"del_{job.id}"):
-                scheduler.remove_job(job.id)
-                st.rerun()
+        import pandas as pd
+
+        # One editor for all jobs instead of a row of widgets per job. Its edits are
+        # stored by row position, so the key changes after a delete to drop them.
+        jobs_rev = st.session_state.get("jobs_editor_rev", 0)
+        edited = st.data_editor(
+            pd.DataFrame(
+                {
+                    "id": [job.id for job in jobs],
+                    "next_run": [job.next_run_time for job in jobs],
+                    "delete": False,
+                }
+            ),
+            column_config={
+                "id": st.column_config.TextColumn("ID"),
+                "next_run": st.column_config.DatetimeColumn("Next Run"),
+                "delete": st.column_config.CheckboxColumn("🗑️", help="Remove this job"),
+            },
+            disabled=["id", "next_run"],
+            hide_index=True,
+            use_container_width=True,
+            key=f"jobs_editor_{jobs_rev}",
+        )
+        to_delete = edited.loc[edited["delete"], "id"].tolist()
+        if to_delete:
+            for job_id in to_delete:
+                scheduler.remove_job(job_id)
+            st.session_state["jobs_editor_rev"] = jobs_rev + 1
+            st.rerun()
 
 with tab_obs:
     st.header("📊 Logs & Observability")
@@ -996,115 +1119,134 @@ with tab_obs:
     log_file = "duckel.log"
 
     # Auto-refresh toggle
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        auto_refresh = st.checkbox("Auto-refresh", value=False)
-    with col2:
-        if st.button("🔄 Refresh Now"):
-            st.rerun()
-    with col3:
-        if st.button("🗑️ Clear Logs"):
-            if os.path.exists(log_file):
-                open(log_file, "w").close()
-            st.rerun()
-
-    if auto_refresh:
-        import time as _time
+    auto_refresh = st.checkbox("Auto-refresh", value=False)
+
+    # Only this panel reruns on the refresh cadence and on its own widgets.
+    # Fragments cannot place widgets in outer containers, so the buttons live here.
+    @st.fragment(run_every="2s" if auto_refresh else None)
+    def _log_panel():
+        # A click already reruns just this fragment, and the log is read below, so
+        # neither button needs an explicit st.rerun()
+        col1, col2, col3 = st.columns([1, 1, 2])
+        with col1:
+            # Tabs run even when hidden, so the log is only read once asked for
+            show_logs = st.toggle("Show logs", value=False, key="obs_show_logs")
+        with col2:
+            st.button("🔄 Refresh Now")
+        with col3:
+            if st.button("🗑️ Clear Logs"):
+                try:
+                    os.truncate(log_file, 0)
+                except FileNotFoundError:
+                    pass
 
-        _time.sleep(2)
-        st.rerun()
+        st.divider()
 
-    st.divider()
+        if not show_logs:
+            st.caption("Switch on **Show logs** to load `duckel.log`.")
+            return
+
+        # duckel.logger rotates to duckel.log.1, .2, ...; those are only read on request
+        full_history = st.checkbox("Include rotated logs (full history)", value=False)
+
+        if os.path.exists(log_file):
+            log_stat = os.stat(log_file)
+            log_df = _read_log(log_file, log_stat.st_mtime_ns, log_stat.st_size, full_history)
+            if full_history:
+                import pandas as pd
+
+                # Oldest first; the backup count is whatever the logger was set up with
+                backups = []
+                for path in glob.glob(f"{glob.escape(log_file)}.*"):
+                    suffix = path.rpartition(".")[2]
+                    if suffix.isdigit():
+                        backups.append(int(suffix))
+                backups.sort(reverse=True)
+                frames = []
+                for i in backups:
+                    backup = f"{log_file}.{i}"
+                    try:
+                        b_stat = os.stat(backup)
+                    except FileNotFoundError:  # rotated away since the glob
+                        continue
+                    frames.append(_read_log(backup, b_stat.st_mtime_ns, b_stat.st_size, full=True))
+                log_df = pd.concat([*frames, log_df], ignore_index=True)
+
+            if not log_df.empty:
+                if not full_history and log_stat.st_size > 2 * _LOG_TAIL_BYTES:
+                    st.caption(
+                        f"Log is {log_stat.st_size / 2**20:.1f} MB; counts and entries cover "
+                        f"its last {_LOG_TAIL_BYTES // 2**20} MB."
+                    )
 
-    if os.path.exists(log_file):
-        with open(log_file) as f:
-            lines = f.readlines()
-
-        if lines:
-            # Summary metrics
-            total_lines = len(lines)
-            error_count = sum(1 for line in lines if "ERROR" in line)
-            warning_count = sum(1 for line in lines if "WARNING" in line)
-            info_count = sum(1 for line in lines if "INFO" in line)
-
-            m1, m2, m3, m4 = st.columns(4)
-            m1.metric("Total Entries", total_lines)
-            m2.metric(
-                "Errors",
-                error_count,
-                delta=None if error_count == 0 else f"{error_count}",
-                delta_color="inverse",
-            )
-            m3.metric("Warnings", warning_count)
-            m4.metric("Info", info_count)
+                # Summary metrics
+                total_lines = len(log_df)
+                level_counts = log_df["level"].value_counts()
+                error_count = int(level_counts.get("ERROR", 0))
+                warning_count = int(level_counts.get("WARNING", 0))
+                info_count = int(level_counts.get("INFO", 0))
+
+                m1, m2, m3, m4 = st.columns(4)
+                m1.metric("Total Entries", total_lines)
+                m2.metric(
+                    "Errors",
+                    error_count,
+                    delta=None if error_count == 0 else f"{error_count}",
+                    delta_color="inverse",
+                )
+                m3.metric("Warnings", warning_count)
+                m4.metric("Info", info_count)
 
-            st.divider()
+                st.divider()
 
-            # Filter options
-            filter_col1, filter_col2 = st.columns([1, 3])
-            with filter_col1:
-                level_filter = st.selectbox(
-                    "Filter by Level", ["ALL", "ERROR", "WARNING", "INFO", "DEBUG"]
-                )
-            with filter_col2:
-                search_term = st.text_input("Search logs", placeholder="Enter search term...")
-
-            # Filter logs
-            filtered_lines = lines
-            if level_filter != "ALL":
-                filtered_lines = [line for line in filtered_lines if level_filter in line]
-            if search_term:
-                filtered_lines = [
-                    line for line in filtered_lines if search_term.lower() in line.lower()
-                ]
-
-            # Display logs with syntax highlighting
-            st.subheader(f"Log Entries ({len(filtered_lines)} shown)")
-
-            # Show last 100 filtered lines, newest first
-            display_lines = filtered_lines[-100:][::-1]
-
-            for line in display_lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Color code by level
-                if "ERROR" in line:
-                    st.markdown(
-                        f'<div class="error-box" style="padding:0.5rem;margin:0.2rem 0;font-family:monospace;font-size:0.85rem;">❌ {line}</div>',
-                        unsafe_allow_html=True,
-                    )
-                elif "WARNING" in line:
-                    st.markdown(
-                        f'<div style="padding:0.5rem;margin:0.2rem 0;background:#fff3cd;border-left:3px solid #ffc107;font-family:monospace;font-size:0.85rem;">⚠️ {line}</div>',
-                        unsafe_allow_html=True,
-                    )
-                elif "INFO" in line:
-                    st.markdown(
-                        f'<div class="info-box" style="padding:0.5rem;margin:0.2rem 0;font-family:monospace;font-size:0.85rem;">ℹ️ {line}</div>',
-                        unsafe_allow_html=True,
-                    )
-                else:
-                    st.markdown(
-                        f'<div style="padding:0.5rem;margin:0.2rem 0;background:#f8f9fa;border-left:3px solid #6c757d;font-family:monospace;font-size:0.85rem;">🔍 {line}</div>',
-                        unsafe_allow_html=True,
+                # Filter options
+                filter_col1, filter_col2 = st.columns([1, 3])
+                with filter_col1:
+                    level_filter = st.selectbox(
+                        "Filter by Level", ["ALL", "ERROR", "WARNING", "INFO", "DEBUG"]
                     )
+                with filter_col2:
+                    search_term = st.text_input("Search logs", placeholder="Enter search term...")
+
+                # Filter logs
+                filtered = log_df
+                if level_filter != "ALL":
+                    filtered = filtered[filtered["level"] == level_filter]
+                if search_term:
+                    filtered = filtered[
+                        filtered["line"].str.contains(search_term, case=False, regex=False)
+                    ]
+
+                # Display logs with syntax highlighting
+                st.subheader(f"Log Entries ({len(filtered)} shown)")
+
+                # Show last 100 filtered lines, newest first
+                display = filtered.iloc[::-1][:100]
+
+                # One markdown element for all entries instead of one per line
+                parts = []
+                for line, level in zip(display["line"], display["level"]):
+                    # Color code by level
+                    head, tail = _LEVEL_HTML.get(level, _LEVEL_HTML[None])
+                    parts.append(head + html.escape(line) + tail)
+                st.markdown("".join(parts), unsafe_allow_html=True)
+            else:
+                st.info("Log file exists but is empty. Run a pipeline to generate logs.")
         else:
-            st.info("Log file exists but is empty. Run a pipeline to generate logs.")
-    else:
-        st.warning("⚠️ No log file found. Run a pipeline to generate logs.")
-        st.markdown(
+            st.warning("⚠️ No log file found. Run a pipeline to generate logs.")
+            st.markdown(
+                """
+            **Expected log file**: `duckel.log`
+
+            Logs will appear here after you execute a pipeline. Each entry includes:
+            - **Timestamp** - When the event occurred
+            - **Level** - ERROR, WARNING, INFO, or DEBUG
+            - **Component** - Which module generated the log
+            - **Message** - Details about the event
             """
-        **Expected log file**: `duckel.log`
-
-        Logs will appear here after you execute a pipeline. Each entry includes:
-        - **Timestamp** - When the event occurred
-        - **Level** - ERROR, WARNING, INFO, or DEBUG
-        - **Component** - Which module generated the log
-        - **Message** - Details about the event
-        """
-        )
+            )
+
+    _log_panel()
 
 # Footer
 st.divider()